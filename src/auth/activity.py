@@ -0,0 +1,168 @@
+import asyncio
+import contextvars
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from auth.services.repository import AuthRepository
+from config.settings import get_settings
+from core.metrics import metrics_registry
+from database.session import async_session_factory
+
+logger = logging.getLogger(__name__)
+
+_settings = get_settings()
+
+activity_flush_duration = metrics_registry.histogram(
+    'user_activity_flush_duration_seconds',
+    'Duration of the batched writes of the user activity times.',
+    (),
+)
+
+
+class ActivityBuffer:
+    """
+    Write-behind buffer of the last login and last seen times of users. Requests only
+    record the times in memory; they are written in one batch every `interval` seconds,
+    as soon as `max_size` users are pending, and on shutdown. A user seen many times
+    between two flushes costs one row. Times still buffered when a worker dies are lost,
+    which is acceptable for activity tracking.
+    """
+
+    def __init__(self, interval: float, max_size: int) -> None:
+        """
+        Initializes a new instance of the ActivityBuffer class.
+
+        Args:
+            interval (float): Seconds between two periodic flushes.
+            max_size (int): Pending users that trigger a flush before the next interval.
+        """
+        self._interval = interval
+        self._max_size = max_size
+        self._pending: dict[Any, tuple[datetime | None, datetime]] = {}
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self._flush_tasks: set[asyncio.Task[int]] = set()
+        self.flushes = 0
+        self.flushed_users = 0
+        self.failures = 0
+        self.last_flush_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record_login(self, user_id: Any) -> None:
+        """
+        Records a successful login of a user, which also counts as activity.
+
+        Args:
+            user_id (Any): The ID of the user.
+        """
+        now = datetime.now(timezone.utc)
+        self._add(user_id, now, now)
+
+    def record_seen(self, user_id: Any) -> None:
+        """
+        Records an authenticated request of a user.
+
+        Args:
+            user_id (Any): The ID of the user.
+        """
+        pending = self._pending.get(user_id)
+        self._add(user_id, pending[0] if pending else None, datetime.now(timezone.utc))
+
+    def _add(self, user_id: Any, login: datetime | None, seen: datetime) -> None:
+        self._pending[user_id] = (login, seen)
+
+        if len(self._pending) >= self._max_size and not self._flush_tasks:
+            # A fresh context keeps the flush out of the statistics of the current request.
+            task = asyncio.get_running_loop().create_task(
+                self.flush(), context=contextvars.Context()
+            )
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+
+    async def flush(self) -> int:
+        """
+        Writes the pending times in one batch. On failure they are put back to be retried
+        by the next flush, unless newer times were recorded meanwhile.
+
+        Returns:
+            int: The number of users written.
+        """
+        async with self._lock:
+            if not self._pending:
+                return 0
+
+            batch, self._pending = self._pending, {}
+            started_at = time.perf_counter()
+
+            try:
+                async with async_session_factory() as session:
+                    await AuthRepository(session).update_activity(
+                        [(user_id, login, seen) for user_id, (login, seen) in batch.items()]
+                    )
+            except Exception:
+                self.failures += 1
+                for user_id, (login, seen) in batch.items():
+                    newer_login, newer_seen = self._pending.get(user_id, (None, seen))
+                    self._pending[user_id] = (newer_login or login, newer_seen)
+                logger.exception('Failed to write the activity of %d users', len(batch))
+                return 0
+            finally:
+                self.last_flush_seconds = time.perf_counter() - started_at
+                activity_flush_duration.observe(self.last_flush_seconds)
+
+        self.flushes += 1
+        self.flushed_users += len(batch)
+
+        return len(batch)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            await self.flush()
+
+    def start(self) -> None:
+        """
+        Starts the periodic flushes.
+        """
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stops the periodic flushes and writes what is still pending.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await asyncio.gather(*self._flush_tasks)
+        await self.flush()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Returns the buffer size and the flush counters, times are in seconds.
+
+        Returns:
+            dict[str, Any]: The buffer counters.
+        """
+        return {
+            'pending': len(self._pending),
+            'flushes': self.flushes,
+            'flushed_users': self.flushed_users,
+            'failures': self.failures,
+            'last_flush_seconds': self.last_flush_seconds,
+        }
+
+
+activity_buffer = ActivityBuffer(
+    interval=_settings.auth_config.activity_flush_seconds,
+    max_size=_settings.auth_config.activity_flush_max_size,
+)
@@ -0,0 +1,158 @@
+from typing import Any, NamedTuple
+
+from auth.constants import (
+    AUTH_MODEL,
+    PRINCIPAL_CACHE_MAX_SIZE,
+    PRINCIPAL_CACHE_TTL_SECONDS,
+    TOKEN_STATE_CACHE_MAX_SIZE,
+    TOKEN_STATE_CACHE_TTL_SECONDS,
+)
+from core.cache import TTLCache
+
+
+class PrincipalCache:
+    """
+    In-process cache of authenticated users keyed by the JWT subject.
+    Only active users are cached, so a hit can skip the database lookup entirely.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        """
+        Initializes a new instance of the PrincipalCache class.
+
+        Args:
+            max_size (int): Maximum number of cached users.
+            ttl (float): Seconds a cached user is trusted before being reloaded.
+        """
+        self._cache: TTLCache[str, AUTH_MODEL] = TTLCache(max_size=max_size, ttl=ttl)
+
+    def get(self, subject: str) -> AUTH_MODEL | None:
+        """
+        Gets a cached user by the JWT subject.
+
+        Args:
+            subject (str): The JWT subject (username).
+
+        Returns:
+            AUTH_MODEL | None: The cached user, or None on a miss.
+        """
+        return self._cache.get(subject)
+
+    def set(self, subject: str, user: AUTH_MODEL) -> None:
+        """
+        Caches a detached copy of the user so it is not tied to the request session.
+
+        Args:
+            subject (str): The JWT subject (username).
+            user (AUTH_MODEL): The authenticated user.
+        """
+        self._cache.set(subject, AUTH_MODEL.model_validate(user.model_dump()))
+
+    def invalidate_user(self, user_id: Any) -> None:
+        """
+        Removes a user from the cache, whatever subject it was cached under.
+
+        Args:
+            user_id (Any): The ID of the user that changed.
+        """
+        self._cache.delete_where(lambda _, user: user.id == user_id)
+
+    def clear(self) -> None:
+        """
+        Removes every user from the cache.
+        """
+        self._cache.clear()
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict[str, int]: Current size, hits and misses.
+        """
+        return self._cache.stats()
+
+
+principal_cache = PrincipalCache(
+    max_size=PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+class TokenState(NamedTuple):
+    """
+    The columns a stateless token is checked against.
+    """
+
+    token_version: int
+    is_active: bool
+
+
+class TokenStateCache:
+    """
+    In-process cache of the token version and active flag of users, keyed by user ID.
+    It backs the revocation check of stateless tokens; the TTL bounds how long a token
+    revoked by another process keeps working.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        """
+        Initializes a new instance of the TokenStateCache class.
+
+        Args:
+            max_size (int): Maximum number of cached users.
+            ttl (float): Seconds a cached state is trusted before being reloaded.
+        """
+        self._cache: TTLCache[Any, TokenState] = TTLCache(max_size=max_size, ttl=ttl)
+
+    def get(self, user_id: Any) -> TokenState | None:
+        """
+        Gets the cached token state of a user.
+
+        Args:
+            user_id (Any): The ID of the user.
+
+        Returns:
+            TokenState | None: The cached state, or None on a miss.
+        """
+        return self._cache.get(user_id)
+
+    def set(self, user_id: Any, state: TokenState) -> None:
+        """
+        Caches the token state of a user.
+
+        Args:
+            user_id (Any): The ID of the user.
+            state (TokenState): The current token version and active flag.
+        """
+        self._cache.set(user_id, state)
+
+    def invalidate_user(self, user_id: Any) -> None:
+        """
+        Removes the state of a user, so the next check reads the database.
+
+        Args:
+            user_id (Any): The ID of the user that changed.
+        """
+        self._cache.delete(user_id)
+
+    def clear(self) -> None:
+        """
+        Removes every state from the cache.
+        """
+        self._cache.clear()
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict[str, int]: Current size, hits and misses.
+        """
+        return self._cache.stats()
+
+
+token_state_cache = TokenStateCache(
+    max_size=TOKEN_STATE_CACHE_MAX_SIZE,
+    ttl=TOKEN_STATE_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,92 @@
+"""
+bcrypt cost calibration.
+
+Times one password hash at increasing bcrypt costs on this host and recommends the highest
+cost whose median hash time fits the latency budget. Run it on the hardware that serves
+the API, then set `BCRYPT_ROUNDS`; existing hashes are rehashed on their next login.
+
+Run it from `src`:
+
+    python -m auth.calibrate
+    python -m auth.calibrate --target-ms 300 --samples 7
+"""
+
+import argparse
+import statistics
+import time
+
+from auth.constants import BCRYPT_MAX_ROUNDS, BCRYPT_MIN_ROUNDS
+
+
+def measure(rounds: int, samples: int) -> float:
+    """
+    Measures the median time of one bcrypt hash.
+
+    Args:
+        rounds (int): The bcrypt cost.
+        samples (int): The number of hashes timed.
+
+    Returns:
+        float: The median hash time in milliseconds.
+    """
+    from passlib.hash import bcrypt  # type: ignore
+
+    hasher = bcrypt.using(rounds=rounds)
+    timings: list[float] = []
+
+    for _ in range(samples):
+        started_at = time.perf_counter()
+        hasher.hash('calibration-password')
+        timings.append((time.perf_counter() - started_at) * 1000)
+
+    return statistics.median(timings)
+
+
+def calibrate(target_ms: float, samples: int) -> int:
+    """
+    Picks the highest bcrypt cost whose median hash time is within the budget. Each extra
+    round doubles the time, so the search stops at the first cost over the budget.
+
+    Args:
+        target_ms (float): The latency budget of one hash, in milliseconds.
+        samples (int): The number of hashes timed per cost.
+
+    Returns:
+        int: The recommended cost, never below the minimum cost.
+    """
+    recommended = BCRYPT_MIN_ROUNDS
+
+    for rounds in range(BCRYPT_MIN_ROUNDS, BCRYPT_MAX_ROUNDS + 1):
+        median_ms = measure(rounds, samples)
+        within = median_ms <= target_ms
+        print(f'rounds={rounds:<3} median={median_ms:>9.1f} ms {"ok" if within else "over"}')
+
+        if not within:
+            break
+        recommended = rounds
+
+    return recommended
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Pick the bcrypt cost for this host.')
+    parser.add_argument(
+        '--target-ms',
+        type=float,
+        help='Latency budget of one hash. Defaults to the BCRYPT_TARGET_MS setting.',
+    )
+    parser.add_argument('--samples', type=int, default=5, help='Hashes timed per cost.')
+    args = parser.parse_args()
+
+    target_ms = args.target_ms
+    if target_ms is None:
+        from config.settings import get_settings
+
+        target_ms = get_settings().auth_config.bcrypt_target_ms
+
+    rounds = calibrate(target_ms, args.samples)
+    print(f'BCRYPT_ROUNDS={rounds}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any
+
+from auth.constants import JWT_ALGORITHM
+from config.settings import get_settings
+
+
+class JWTDecodeError(Exception):
+    """
+    Raised when a token is malformed, its signature does not match or it has expired.
+    """
+
+
+class JWTCodec(ABC):
+    """
+    Signs and verifies JWTs with a shared secret. Backends are interchangeable, they all
+    produce and accept the same HS256 tokens.
+    """
+
+    algorithm: str = JWT_ALGORITHM
+
+    def __init__(self, key: str) -> None:
+        """
+        Initializes a new instance of the JWTCodec class.
+
+        Args:
+            key (str): The signing key.
+        """
+        self._key = key
+
+    @abstractmethod
+    def encode(self, claims: dict[str, Any]) -> str:
+        """
+        Signs the claims into a token.
+
+        Args:
+            claims (dict[str, Any]): JSON compatible claims, `exp` as a Unix timestamp.
+
+        Returns:
+            str: The token.
+        """
+        pass
+
+    @abstractmethod
+    def decode(self, token: str) -> dict[str, Any]:
+        """
+        Verifies the signature and the expiration of a token and returns its claims.
+
+        Args:
+            token (str): The token.
+
+        Raises:
+            JWTDecodeError: If the token is not valid.
+
+        Returns:
+            dict[str, Any]: The claims of the token.
+        """
+        pass
+
+
+class JoseJWTCodec(JWTCodec):
+    """
+    Codec backed by python-jose.
+    """
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        from jose import jwt  # type: ignore
+
+        token: str = jwt.encode(claims, key=self._key, algorithm=self.algorithm)
+        return token
+
+    def decode(self, token: str) -> dict[str, Any]:
+        from jose import JWTError, jwt
+
+        try:
+            claims: dict[str, Any] = jwt.decode(token, self._key, algorithms=[self.algorithm])
+        except JWTError as exc:
+            raise JWTDecodeError(str(exc)) from exc
+
+        return claims
+
+
+class PyJWTCodec(JWTCodec):
+    """
+    Codec backed by PyJWT, installed with the `pyjwt` extra.
+    """
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        import jwt
+
+        return jwt.encode(claims, key=self._key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> dict[str, Any]:
+        import jwt
+
+        try:
+            claims: dict[str, Any] = jwt.decode(token, self._key, algorithms=[self.algorithm])
+        except jwt.PyJWTError as exc:
+            raise JWTDecodeError(str(exc)) from exc
+
+        return claims
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b'=' * (-len(data) % 4))
+
+
+class HMACJWTCodec(JWTCodec):
+    """
+    Minimal HS256 codec on the standard library `hmac`, without the algorithm negotiation
+    and key handling of the generic libraries. Only HS256 tokens are accepted, the `exp`
+    and `nbf` claims are checked when present.
+    """
+
+    def __init__(self, key: str) -> None:
+        super().__init__(key)
+        self._key_bytes = key.encode()
+        self._header = _b64encode(b'{"alg":"HS256","typ":"JWT"}')
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        return _b64encode(hmac.new(self._key_bytes, signing_input, hashlib.sha256).digest())
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        payload = _b64encode(json.dumps(claims, separators=(',', ':')).encode())
+        signing_input = self._header + b'.' + payload
+
+        return (signing_input + b'.' + self._sign(signing_input)).decode()
+
+    def decode(self, token: str) -> dict[str, Any]:
+        try:
+            signing_input, signature = token.encode('ascii').rsplit(b'.', 1)
+            header, payload = signing_input.split(b'.')
+
+            # Tokens signed here all share the same header, any other one is parsed.
+            if header != self._header and json.loads(_b64decode(header)).get('alg') != 'HS256':
+                raise JWTDecodeError('The token algorithm is not allowed.')
+
+            if not hmac.compare_digest(signature, self._sign(signing_input)):
+                raise JWTDecodeError('Signature verification failed.')
+
+            claims = json.loads(_b64decode(payload))
+        except JWTDecodeError:
+            raise
+        except (ValueError, AttributeError) as exc:
+            raise JWTDecodeError('The token is malformed.') from exc
+
+        if not isinstance(claims, dict):
+            raise JWTDecodeError('The token claims are not an object.')
+
+        now = time.time()
+
+        exp = claims.get('exp')
+        if exp is not None and (not isinstance(exp, (int, float)) or exp <= now):
+            raise JWTDecodeError('The token has expired.')
+
+        nbf = claims.get('nbf')
+        if nbf is not None and (not isinstance(nbf, (int, float)) or nbf > now):
+            raise JWTDecodeError('The token is not yet valid.')
+
+        return claims
+
+
+JWT_CODECS: dict[str, type[JWTCodec]] = {
+    'jose': JoseJWTCodec,
+    'pyjwt': PyJWTCodec,
+    'hmac': HMACJWTCodec,
+}
+
+
+@lru_cache
+def get_jwt_codec() -> JWTCodec:
+    """
+    Returns the codec selected by the `jwt_codec` setting.
+
+    Returns:
+        JWTCodec: The JWT codec of the application.
+    """
+    settings = get_settings()
+
+    return JWT_CODECS[settings.auth_config.jwt_codec](settings.secret_key)
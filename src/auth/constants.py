@@ -1,12 +1,39 @@
+import os
+
 from user.models.general import User
 
 JWT_ALGORITHM = 'HS256'
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+REFRESH_TOKEN_EXPIRE_DAYS = 30
+REFRESH_TOKEN_BYTES = 32
+
+PRINCIPAL_CACHE_MAX_SIZE = 1024
+PRINCIPAL_CACHE_TTL_SECONDS = 60
+
+TOKEN_STATE_CACHE_MAX_SIZE = 4096
+TOKEN_STATE_CACHE_TTL_SECONDS = 5
+
+PASSWORD_HASHER_MAX_WORKERS = os.cpu_count() or 1
+
+LOGIN_THROTTLE_MAX_KEYS = 100_000
+
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_MAX_ROUNDS = 16
 
 AUTH_MODEL = User
 
 __all__ = [
     'JWT_ALGORITHM',
     'ACCESS_TOKEN_EXPIRE_MINUTES',
+    'REFRESH_TOKEN_EXPIRE_DAYS',
+    'REFRESH_TOKEN_BYTES',
+    'PRINCIPAL_CACHE_MAX_SIZE',
+    'PRINCIPAL_CACHE_TTL_SECONDS',
+    'TOKEN_STATE_CACHE_MAX_SIZE',
+    'TOKEN_STATE_CACHE_TTL_SECONDS',
+    'PASSWORD_HASHER_MAX_WORKERS',
+    'LOGIN_THROTTLE_MAX_KEYS',
+    'BCRYPT_MIN_ROUNDS',
+    'BCRYPT_MAX_ROUNDS',
     'AUTH_MODEL',
 ]
@@ -9,20 +9,21 @@ from auth.constants import AUTH_MODEL
 from auth.exceptions import JWTInvalidCredentials
 from auth.services.repository import AuthRepository
 from auth.services.services import AuthJWTService
-from database.session import get_session
+from database.session import get_read_session
 
 authorization_scheme = HTTPBearer(auto_error=False)
 
 
 async def authentication(
-    db_session: Annotated[AsyncSession, Depends(get_session)],
+    db_session: Annotated[AsyncSession, Depends(get_read_session)],
     token: HTTPAuthorizationCredentials | None = Depends(authorization_scheme),
 ) -> AUTH_MODEL:
     """
     Get the current user from the provided database session.
 
     Args:
-        db_session (AsyncSession, optional): The database session. Defaults to Depends(get_session).
+        db_session (AsyncSession, optional): The database session.
+            Defaults to Depends(get_read_session).
 
     Returns:
         User: The current user.
@@ -37,3 +37,22 @@ class JWTUserInactive(APIHTTPException):
             error_code='jwt_user_inactive',
             status_code=status.HTTP_401_UNAUTHORIZED,
         )
+
+
+class JWTInvalidRefreshToken(APIHTTPException):
+    def __init__(self) -> None:
+        super().__init__(
+            detail='The refresh token is invalid, expired or revoked.',
+            error_code='invalid_refresh_token',
+            status_code=status.HTTP_401_UNAUTHORIZED,
+        )
+
+
+class JWTTooManyLoginAttempts(APIHTTPException):
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(
+            detail='Too many login attempts, try again later.',
+            error_code='too_many_login_attempts',
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers={'Retry-After': str(retry_after)},
+        )
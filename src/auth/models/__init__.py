@@ -0,0 +1,5 @@
+from .refresh_token import RefreshToken
+
+__all__ = [
+    'RefreshToken',
+]
@@ -0,0 +1,38 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, func
+from sqlmodel import Field
+
+from database.base import BaseSQLModel
+
+
+class RefreshToken(BaseSQLModel, table=True):
+    """
+    This class represents a refresh token. Only the SHA-256 hash of the token is stored.
+    Tokens rotate: each refresh revokes the used token and issues a new one in the same
+    family, so a revoked token presented again reveals a leak and revokes the family.
+    """
+
+    __tablename__ = 'refresh_token'
+
+    user_id: int = Field(
+        sa_column=Column(
+            Integer, ForeignKey('user.id', ondelete='CASCADE'), nullable=False, index=True
+        )
+    )
+    token_hash: str = Field(max_length=64, unique=True)
+    family_id: str = Field(max_length=32, index=True)
+    token_version: int = Field(default=0)
+    expires_at: datetime = Field(sa_column=Column(DateTime(timezone=True), nullable=False))
+    revoked_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(
+            DateTime(timezone=True),
+            server_default=func.now(),
+            nullable=True,
+        ),
+    )
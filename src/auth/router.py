@@ -1,44 +1,114 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Body, Depends, status
+from fastapi import APIRouter, Body, Depends, Request, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from auth.schemas import JWTPasswordCredentialsSchema, JWTTokenSchema
+from auth.schemas import (
+    JWTPasswordCredentialsSchema,
+    JWTRefreshTokenSchema,
+    JWTRevokedSchema,
+    JWTTokenSchema,
+)
 from auth.services.repository import AuthRepository
 from auth.services.services import AuthJWTService
+from auth.throttling import login_throttle
+from core.routing import CAPIRoute
 from core.schemas.responses import ResponseSchema
 from core.tags import OpenAPITags
+from database.instrumentation import query_budget
 from database.session import get_session
 
-router = APIRouter(prefix='/auth', tags=[OpenAPITags.AUTH])
+router = APIRouter(prefix='/auth', tags=[OpenAPITags.AUTH], route_class=CAPIRoute)
 
 
 @router.post('/token')
+@query_budget(3)
 async def get_token(
+    request: Request,
     credentials: Annotated[JWTPasswordCredentialsSchema, Body(...)],
     db_session: AsyncSession = Depends(get_session),
 ) -> ResponseSchema[JWTTokenSchema]:
     """
-    Retrieves a JWT token based on the provided credentials.
+    Retrieves a JWT access token and a refresh token based on the provided credentials.
+    Attempts are throttled per client IP and per username before the password is checked.
 
     Args:
+        request (Request): The request, for the client IP.
         credentials (JWTPasswordCredentialsSchema): The user's credentials.
         db_session (AsyncSession, optional): The database session. Defaults to Depends(get_session).
 
     Returns:
-        ResponseSchema[JWTTokenSchema]: The response containing the JWT token.
+        ResponseSchema[JWTTokenSchema]: The response containing the JWT tokens.
 
     """
     _service = AuthJWTService(AuthRepository(async_session=db_session))
+    client_ip = login_throttle.client_ip(request)
 
-    jwt_token = await _service.create_access_token(credentials=credentials)
+    async with login_throttle.admit(credentials.username, client_ip):
+        jwt_token = await _service.create_tokens(credentials=credentials)
 
     response = ResponseSchema(
         code=0,
-        data=JWTTokenSchema(
-            access_token=jwt_token,
-            token_type='bearer',
-        ),
+        data=jwt_token,
+        status_code=status.HTTP_200_OK,
+    )
+    return response
+
+
+@router.post('/refresh')
+@query_budget(3)
+async def refresh_token(
+    body: Annotated[JWTRefreshTokenSchema, Body(...)],
+    db_session: AsyncSession = Depends(get_session),
+) -> ResponseSchema[JWTTokenSchema]:
+    """
+    Exchanges a refresh token for a new access token and a rotated refresh token,
+    without checking the password again.
+
+    Args:
+        body (JWTRefreshTokenSchema): The refresh token.
+        db_session (AsyncSession, optional): The database session. Defaults to Depends(get_session).
+
+    Returns:
+        ResponseSchema[JWTTokenSchema]: The response containing the new JWT tokens.
+
+    """
+    _service = AuthJWTService(AuthRepository(async_session=db_session))
+
+    jwt_token = await _service.refresh_tokens(body.refresh_token)
+
+    response = ResponseSchema(
+        code=0,
+        data=jwt_token,
+        status_code=status.HTTP_200_OK,
+    )
+    return response
+
+
+@router.post('/revoke')
+@query_budget(2)
+async def revoke_token(
+    body: Annotated[JWTRefreshTokenSchema, Body(...)],
+    db_session: AsyncSession = Depends(get_session),
+) -> ResponseSchema[JWTRevokedSchema]:
+    """
+    Revokes a refresh token and every token rotated from the same login.
+
+    Args:
+        body (JWTRefreshTokenSchema): The refresh token.
+        db_session (AsyncSession, optional): The database session. Defaults to Depends(get_session).
+
+    Returns:
+        ResponseSchema[JWTRevokedSchema]: Whether the token family was revoked.
+
+    """
+    _service = AuthJWTService(AuthRepository(async_session=db_session))
+
+    revoked = await _service.revoke_refresh_token(body.refresh_token)
+
+    response = ResponseSchema(
+        code=0,
+        data=JWTRevokedSchema(revoked=revoked),
         status_code=status.HTTP_200_OK,
     )
     return response
@@ -12,6 +12,22 @@ class JWTTokenSchema(BaseModel):
         ],
     )
     token_type: str = Field(description='Token type', examples=['Bearer'])
+    refresh_token: Optional[str] = Field(
+        default=None,
+        description='Rotating refresh token, exchanged at /auth/refresh for new tokens',
+        examples=['3q2-7wEj9K1xQ0oUeW2y5xJfZ4mN8bVtC6rLhPaDsGk'],
+    )
+
+
+class JWTRefreshTokenSchema(BaseModel):
+    refresh_token: str = Field(
+        description='Refresh token',
+        examples=['3q2-7wEj9K1xQ0oUeW2y5xJfZ4mN8bVtC6rLhPaDsGk'],
+    )
+
+
+class JWTRevokedSchema(BaseModel):
+    revoked: bool = Field(description='Whether a token family was revoked', examples=[True])
 
 
 class JWTPasswordCredentialsSchema(BaseModel):
@@ -38,6 +54,16 @@ class JWTUserSchema(BaseModel):
         description='Email',
         examples=['test@test.com'],
     )
+    first_name: Optional[str] = Field(
+        default=None,
+        description='First name',
+        examples=['John'],
+    )
+    last_name: Optional[str] = Field(
+        default=None,
+        description='Last name',
+        examples=['Doe'],
+    )
     full_name: Optional[str] = Field(
         description='Full name',
         examples=['John Doe'],
@@ -50,6 +76,12 @@ class JWTTokenDataSchema(BaseModel):
     exp: Optional[datetime] = Field(
         default=None, description='Expiration time', examples=[datetime.now()]
     )
+    active: Optional[bool] = Field(
+        default=None, description='Whether the user was active when the token was issued'
+    )
+    ver: Optional[int] = Field(
+        default=None, description='Token version of the user, bumped to revoke its tokens'
+    )
 
     model_config = {
         'validate_assignment': True,
@@ -1,7 +1,13 @@
+from datetime import datetime
+from typing import Any, Sequence
+
+from sqlalchemy import DateTime, Integer, bindparam, cast, column, func, values
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
+from sqlmodel import col, select, update
 
+from auth.cache import TokenState
 from auth.constants import AUTH_MODEL
+from auth.models import RefreshToken
 from database.repository import SQLModelRepository
 
 
@@ -11,7 +17,8 @@ class AuthRepository(SQLModelRepository[AUTH_MODEL]):
 
     async def get_user_by_username(self, username: str) -> AUTH_MODEL | None:
         """
-        Gets a user by their username.
+        Gets a user by their username. Concurrent lookups of the same username share
+        a single query.
 
         Args:
             username (str): The username of the user.
@@ -19,8 +26,186 @@ class AuthRepository(SQLModelRepository[AUTH_MODEL]):
         Returns:
             AUTH_MODEL: The user with the provided username.
         """
-        statement = select(self._model).where(self._model.username == username)
 
-        result = await self.async_session.execute(statement)
+        async def load() -> AUTH_MODEL | None:
+            statement = select(self._model).where(self._model.username == username)
+            result = await self._execute(statement)
+            return result.scalar_one_or_none()
+
+        return await self._single_flight((self._model, 'username', username), load)
+
+    async def get_token_state(self, id: Any) -> TokenState | None:
+        """
+        Gets the token version and active flag of a user, without loading the whole row.
+
+        Args:
+            id (Any): The ID of the user.
+
+        Returns:
+            TokenState | None: The token state, or None if the user does not exist.
+        """
+        statement = select(col(self._model.token_version), col(self._model.is_active)).where(
+            col(self._model.id) == id
+        )
+
+        result = await self._execute(statement)
+        row = result.one_or_none()
+
+        return TokenState(*row) if row is not None else None
+
+    async def update_password_hash(
+        self, user: AUTH_MODEL, hashed_password: str, new_hashed_password: str
+    ) -> None:
+        """
+        Replaces an outdated password hash of the same password. The update only applies if
+        the password was not changed meanwhile, and it leaves `updated_at` and the token
+        version alone, since the user did not change. Not committed.
+
+        Args:
+            user (AUTH_MODEL): The user whose password was verified.
+            hashed_password (str): The outdated hash that was verified.
+            new_hashed_password (str): The hash with the current policy.
+        """
+        statement = (
+            update(self._model)
+            .where(
+                col(self._model.id) == user.id,
+                col(self._model.hashed_password) == hashed_password,
+            )
+            .values(hashed_password=new_hashed_password, updated_at=self._model.updated_at)
+        )
+
+        await self._execute(statement)
+        await self._invalidate(user.id)
+
+    async def add_refresh_token(self, refresh_token: RefreshToken) -> None:
+        """
+        Stores a refresh token and commits.
+
+        Args:
+            refresh_token (RefreshToken): The refresh token, with the hash of the token.
+        """
+        self.async_session.add(refresh_token)
+        await self._commit()
+
+    async def use_refresh_token(self, token_hash: str, now: datetime) -> RefreshToken | None:
+        """
+        Revokes a live refresh token in a single UPDATE ... RETURNING, so concurrent
+        refreshes with the same token cannot both succeed. Not committed.
+
+        Args:
+            token_hash (str): The SHA-256 hash of the token.
+            now (datetime): The current time.
+
+        Returns:
+            RefreshToken | None: The token, or None if it is unknown, expired or revoked.
+        """
+        statement = (
+            update(RefreshToken)
+            .where(
+                col(RefreshToken.token_hash) == token_hash,
+                col(RefreshToken.revoked_at).is_(None),
+                col(RefreshToken.expires_at) > now,
+            )
+            .values(revoked_at=now)
+            .returning(RefreshToken)
+        )
+
+        result = await self._execute(statement)
+
+        return result.scalar_one_or_none()
+
+    async def get_refresh_token(self, token_hash: str) -> RefreshToken | None:
+        """
+        Gets a refresh token by the hash of the token.
+
+        Args:
+            token_hash (str): The SHA-256 hash of the token.
+
+        Returns:
+            RefreshToken | None: The token, or None if it is unknown.
+        """
+        statement = select(RefreshToken).where(col(RefreshToken.token_hash) == token_hash)
+
+        result = await self._execute(statement)
 
         return result.scalar_one_or_none()
+
+    async def revoke_refresh_token_family(self, family_id: str, now: datetime) -> None:
+        """
+        Revokes every live token of a refresh token family and commits.
+
+        Args:
+            family_id (str): The family, shared by all the rotations of a login.
+            now (datetime): The current time.
+        """
+        statement = (
+            update(RefreshToken)
+            .where(col(RefreshToken.family_id) == family_id, col(RefreshToken.revoked_at).is_(None))
+            .values(revoked_at=now)
+        )
+
+        await self._execute(statement)
+        await self._commit()
+
+    async def update_activity(
+        self, activity: Sequence[tuple[Any, datetime | None, datetime]]
+    ) -> None:
+        """
+        Stores the last login and last seen times of many users in one batch and commits.
+        On PostgreSQL it is a single UPDATE ... FROM (VALUES ...), elsewhere an executemany.
+        Times never move backwards, a login time only replaces the stored one when set,
+        and `updated_at` is kept since the profile did not change.
+
+        Args:
+            activity (Sequence[tuple[Any, datetime | None, datetime]]): The user ID, last
+                login time (None without a login) and last seen time of each user.
+        """
+        table = self._model.__table__  # type: ignore [attr-defined]
+        timestamp = DateTime(timezone=True)
+
+        if self.async_session.bind.dialect.name == 'postgresql':
+            rows = values(
+                column('id', Integer),
+                column('last_login_at', timestamp),
+                column('last_seen_at', timestamp),
+                name='activity',
+            ).data(list(activity))
+
+            statement = (
+                update(table)
+                .where(table.c.id == rows.c.id)
+                .values(
+                    # GREATEST ignores NULLs, so users without a login keep theirs.
+                    last_login_at=func.greatest(
+                        table.c.last_login_at, cast(rows.c.last_login_at, timestamp)
+                    ),
+                    last_seen_at=func.greatest(
+                        table.c.last_seen_at, cast(rows.c.last_seen_at, timestamp)
+                    ),
+                    updated_at=table.c.updated_at,
+                )
+            )
+            await self._execute(statement)
+        else:
+            statement = (
+                update(table)
+                .where(table.c.id == bindparam('activity_id'))
+                .values(
+                    last_login_at=func.coalesce(
+                        bindparam('activity_login', type_=timestamp), table.c.last_login_at
+                    ),
+                    last_seen_at=bindparam('activity_seen', type_=timestamp),
+                    updated_at=table.c.updated_at,
+                )
+            )
+            await self._execute(
+                statement,
+                [
+                    {'activity_id': id, 'activity_login': login, 'activity_seen': seen}
+                    for id, login, seen in activity
+                ],
+            )
+
+        # The activity times are not cached, so the cached rows stay valid.
+        await self._commit()
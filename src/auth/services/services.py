@@ -1,67 +1,81 @@
+import hashlib
+import secrets
+import time
+import uuid
 from datetime import datetime, timedelta, timezone
+from typing import Any
 
-from jose import JWTError, jwt  # type: ignore
-
+from auth.activity import activity_buffer
+from auth.cache import principal_cache, token_state_cache
+from auth.codecs import JWTDecodeError, get_jwt_codec
 from auth.constants import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
     AUTH_MODEL,
-    JWT_ALGORITHM,
+    REFRESH_TOKEN_BYTES,
+    REFRESH_TOKEN_EXPIRE_DAYS,
 )
 from auth.exceptions import (
     JWTInvalidCredentials,
+    JWTInvalidRefreshToken,
     JWTNoAuthorizationAccess,
     JWTUnknownError,
     JWTUserInactive,
 )
+from auth.models import RefreshToken
 from auth.schemas import (
     JWTPasswordCredentialsSchema,
     JWTTokenDataSchema,
-    JWTUserSchema,
+    JWTTokenSchema,
 )
 from auth.services.repository import AuthRepository
-from auth.utils import verify_password
+from auth.utils import verify_and_update_password_async
 from config.settings import get_settings
+from core.timing import phase
 
 _settings = get_settings()
 
 
+def _hash_refresh_token(token: str) -> str:
+    # Refresh tokens are random 256-bit values, a fast unsalted hash is enough to store them.
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 class AuthJWTService:
-    _JWT_ALGORITHM: str = JWT_ALGORITHM
     _ACCESS_TOKEN_EXPIRE_MINUTES: int = ACCESS_TOKEN_EXPIRE_MINUTES
-    _SECRET_KEY: str
     _repository: AuthRepository
 
     def __init__(self, repository: AuthRepository) -> None:
-        self._SECRET_KEY = _settings.secret_key
         self._repository = repository
 
-    def __create_access_token(self, data: JWTTokenDataSchema) -> str:
+    def __create_access_token(self, claims: dict[str, Any]) -> str:
         """
-        Creates an access token with the provided data.
+        Creates an access token with the provided claims, expiring after
+        `ACCESS_TOKEN_EXPIRE_MINUTES`.
 
         Args:
-            data (JWTTokenDataSchema): The data to be encoded in the access token.
+            claims (dict[str, Any]): The JSON compatible claims of the access token.
 
         Returns:
             str: The generated access token.
         """
-        expire = datetime.now(timezone.utc) + timedelta(minutes=self._ACCESS_TOKEN_EXPIRE_MINUTES)
-        data.exp = expire
-        jwt_token: str = jwt.encode(
-            data.model_dump(), key=self._SECRET_KEY, algorithm=self._JWT_ALGORITHM
-        )
+        claims['exp'] = int(time.time()) + self._ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+        with phase('jwt'):
+            jwt_token = get_jwt_codec().encode(claims)
 
         return jwt_token
 
-    async def create_access_token(self, credentials: JWTPasswordCredentialsSchema) -> str:
+    async def authenticate(self, credentials: JWTPasswordCredentialsSchema) -> AUTH_MODEL:
         """
-        Creates an access token for the provided user.
+        Verifies the username and password of a user, this is where bcrypt runs.
+        A hash made with an outdated bcrypt cost is replaced, and stored with the next commit.
+        The login time is buffered and written later in a batch.
 
         Args:
-            user (JWTTokenDataSchema): The user to create the access token for.
+            credentials (JWTPasswordCredentialsSchema): The user's credentials.
 
         Returns:
-            str: The generated access token.
+            AUTH_MODEL: The authenticated user.
         """
         user = await self._repository.get_user_by_username(credentials.username)
 
@@ -73,26 +87,159 @@ class AuthJWTService:
 
         salt = user.created_at.isoformat()  # type: ignore
 
-        if not verify_password(credentials.password, salt, user.hashed_password):
+        verified, new_hashed_password = await verify_and_update_password_async(
+            credentials.password, salt, user.hashed_password
+        )
+        if not verified:
             raise JWTInvalidCredentials
 
-        user_data = JWTUserSchema(
-            id=user.id,
-            username=user.username,
-            email=user.email,
-            full_name=user.full_name,
+        if new_hashed_password is not None:
+            await self._repository.update_password_hash(
+                user, user.hashed_password, new_hashed_password
+            )
+
+        activity_buffer.record_login(user.id)
+
+        return user
+
+    def _create_user_access_token(self, user: AUTH_MODEL) -> str:
+        """
+        Creates an access token carrying the claims of the user.
+
+        Args:
+            user (AUTH_MODEL): The user to create the access token for.
+
+        Returns:
+            str: The generated access token.
+        """
+        # The claims follow `JWTTokenDataSchema`, built as plain data to skip the model dump.
+        claims: dict[str, Any] = {
+            'sub': user.username,
+            'user': {
+                'id': user.id,
+                'username': user.username,
+                'email': user.email,
+                'first_name': user.first_name,
+                'last_name': user.last_name,
+                'full_name': user.full_name,
+            },
+            'active': user.is_active,
+            'ver': user.token_version,
+        }
+
+        return self.__create_access_token(claims)
+
+    async def _create_refresh_token(self, user: AUTH_MODEL, family_id: str | None = None) -> str:
+        """
+        Creates and stores a refresh token, only its SHA-256 hash is persisted.
+
+        Args:
+            user (AUTH_MODEL): The user the token belongs to.
+            family_id (str | None): The family of the token being rotated, None for a login.
+
+        Returns:
+            str: The refresh token.
+        """
+        if user.id is None:
+            # Only stored users can log in, this is a user built from claims.
+            raise JWTUnknownError
+
+        token = secrets.token_urlsafe(REFRESH_TOKEN_BYTES)
+
+        await self._repository.add_refresh_token(
+            RefreshToken(
+                user_id=user.id,
+                token_hash=_hash_refresh_token(token),
+                family_id=family_id or uuid.uuid4().hex,
+                token_version=user.token_version,
+                expires_at=datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+            )
         )
 
-        token_data = JWTTokenDataSchema(
-            sub=user.username,
-            user=user_data,
+        return token
+
+    async def create_tokens(self, credentials: JWTPasswordCredentialsSchema) -> JWTTokenSchema:
+        """
+        Logs a user in, creating an access token and a new refresh token family.
+
+        Args:
+            credentials (JWTPasswordCredentialsSchema): The user's credentials.
+
+        Returns:
+            JWTTokenSchema: The access and refresh tokens.
+        """
+        user = await self.authenticate(credentials)
+
+        return JWTTokenSchema(
+            access_token=self._create_user_access_token(user),
+            token_type='bearer',
+            refresh_token=await self._create_refresh_token(user),
         )
 
-        return self.__create_access_token(token_data)
+    async def refresh_tokens(self, refresh_token: str) -> JWTTokenSchema:
+        """
+        Exchanges a refresh token for a new access token and a rotated refresh token,
+        without checking the password. A revoked token presented again means it leaked,
+        so its whole family is revoked.
+
+        Args:
+            refresh_token (str): The refresh token.
+
+        Returns:
+            JWTTokenSchema: The new access and refresh tokens.
+        """
+        token_hash = _hash_refresh_token(refresh_token)
+        now = datetime.now(timezone.utc)
+
+        record = await self._repository.use_refresh_token(token_hash, now)
+
+        if record is None:
+            reused = await self._repository.get_refresh_token(token_hash)
+            if reused is not None and reused.revoked_at is not None:
+                await self._repository.revoke_refresh_token_family(reused.family_id, now)
+            raise JWTInvalidRefreshToken
+
+        user = await self._repository.get(record.user_id)
+
+        if user is None or user.token_version != record.token_version:
+            await self._repository.revoke_refresh_token_family(record.family_id, now)
+            raise JWTInvalidRefreshToken
+
+        if not user.is_active:
+            await self._repository.revoke_refresh_token_family(record.family_id, now)
+            raise JWTUserInactive
+
+        return JWTTokenSchema(
+            access_token=self._create_user_access_token(user),
+            token_type='bearer',
+            refresh_token=await self._create_refresh_token(user, record.family_id),
+        )
+
+    async def revoke_refresh_token(self, refresh_token: str) -> bool:
+        """
+        Revokes the family of a refresh token, logging its login out everywhere it was rotated.
+
+        Args:
+            refresh_token (str): The refresh token.
+
+        Returns:
+            bool: True if the token exists and its family was revoked.
+        """
+        record = await self._repository.get_refresh_token(_hash_refresh_token(refresh_token))
+
+        if record is None:
+            return False
+
+        await self._repository.revoke_refresh_token_family(
+            record.family_id, datetime.now(timezone.utc)
+        )
+
+        return True
 
     async def get_current_user(self, token: str) -> AUTH_MODEL:
         """
         Decodes the provided token and returns the user associated with it.
+        The request is recorded as activity of the user, written later in a batch.
 
         Args:
             token (str): The token to decode.
@@ -100,13 +247,42 @@ class AuthJWTService:
         Returns:
             JWTTokenDataSchema: The user associated with the token.
         """
+        user = await self._get_token_user(token)
+
+        activity_buffer.record_seen(user.id)
+
+        return user
+
+    async def _get_token_user(self, token: str) -> AUTH_MODEL:
+        """
+        Decodes the provided token and returns the user associated with it.
+        Active users are served from the principal cache when possible.
+        In stateless mode, tokens carrying a token version are verified from their claims
+        instead, see `_get_stateless_user`.
+
+        Args:
+            token (str): The token to decode.
+
+        Returns:
+            AUTH_MODEL: The user associated with the token.
+        """
         try:
-            payload = jwt.decode(token, self._SECRET_KEY, algorithms=[self._JWT_ALGORITHM])
+            with phase('jwt'):
+                payload = get_jwt_codec().decode(token)
+
+        except JWTDecodeError:
+            raise JWTNoAuthorizationAccess
+
+        if _settings.auth_config.jwt_stateless and payload.get('ver') is not None:
+            return await self._get_stateless_user(JWTTokenDataSchema.model_validate(payload))
 
-        except JWTError:
+        username = payload.get('sub')
+        if not isinstance(username, str):
             raise JWTNoAuthorizationAccess
 
-        username: str = payload.get('sub')
+        user = principal_cache.get(username)
+        if user is not None:
+            return user
 
         user = await self._repository.get_user_by_username(username)
 
@@ -116,4 +292,49 @@ class AuthJWTService:
         if not user.is_active:
             raise JWTUserInactive
 
+        principal_cache.set(username, user)
+
         return user
+
+    async def _get_stateless_user(self, claims: JWTTokenDataSchema) -> AUTH_MODEL:
+        """
+        Authenticates from the token claims alone. The only lookup is the revocation check,
+        the current token version and active flag of the user, served from a short-lived cache.
+        Bumping `token_version` revokes every token issued before.
+
+        Args:
+            claims (JWTTokenDataSchema): The verified token claims.
+
+        Returns:
+            AUTH_MODEL: A detached snapshot of the user built from the claims, without
+            `created_at` and `updated_at`.
+        """
+        if not claims.active:
+            raise JWTUserInactive
+
+        user_id = claims.user.id
+
+        state = token_state_cache.get(user_id)
+        if state is None:
+            state = await self._repository.get_token_state(user_id)
+
+            if state is None:
+                raise JWTUnknownError
+
+            token_state_cache.set(user_id, state)
+
+        if not state.is_active:
+            raise JWTUserInactive
+
+        if state.token_version != claims.ver:
+            raise JWTNoAuthorizationAccess
+
+        return AUTH_MODEL(
+            id=user_id,
+            username=claims.user.username,
+            email=claims.user.email,
+            first_name=claims.user.first_name or '',
+            last_name=claims.user.last_name or '',
+            is_active=True,
+            token_version=state.token_version,
+        )
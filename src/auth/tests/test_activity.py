@@ -0,0 +1,113 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Sequence
+
+import pytest
+from sqlmodel import select
+
+from auth.activity import ActivityBuffer
+from auth.services.repository import AuthRepository
+from database.session import async_session_factory
+from user.models.general import User
+
+pytestmark = pytest.mark.anyio
+
+UserFactory = Callable[..., Awaitable[dict[str, Any]]]
+
+
+async def _get_user(id: int) -> User:
+    async with async_session_factory() as session:
+        return (await session.exec(select(User).where(User.id == id))).one()
+
+
+async def test_record_seen_keeps_the_pending_login() -> None:
+    buffer = ActivityBuffer(interval=60, max_size=100)
+
+    buffer.record_login(1)
+    login, seen = buffer._pending[1]
+    buffer.record_seen(1)
+    buffer.record_seen(2)
+
+    assert len(buffer) == 2
+    assert buffer._pending[1][0] == login
+    assert buffer._pending[1][1] >= seen
+    assert buffer._pending[2][0] is None
+
+
+async def test_flush_writes_the_times_in_one_batch(create_user: UserFactory) -> None:
+    first = await create_user('john_doe')
+    second = await create_user('jane_doe')
+    updated_at = (await _get_user(first['id'])).updated_at
+    buffer = ActivityBuffer(interval=60, max_size=100)
+
+    buffer.record_login(first['id'])
+    buffer.record_seen(second['id'])
+
+    assert await buffer.flush() == 2
+    assert len(buffer) == 0
+    john, jane = await _get_user(first['id']), await _get_user(second['id'])
+    assert john.last_login_at is not None
+    assert john.last_seen_at is not None
+    assert john.updated_at == updated_at
+    assert jane.last_login_at is None
+    assert jane.last_seen_at is not None
+    assert buffer.stats()['flushed_users'] == 2
+
+
+async def test_a_failed_flush_keeps_the_times_for_the_next_one(
+    database: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    batches: list[Sequence[Any]] = []
+    seen_meanwhile: list[datetime] = []
+
+    async def update_activity(self: AuthRepository, activity: Sequence[Any]) -> None:
+        batches.append(activity)
+        if len(batches) == 1:
+            buffer.record_seen(1)
+            seen_meanwhile.append(buffer._pending[1][1])
+            raise RuntimeError('database is down')
+
+    monkeypatch.setattr(AuthRepository, 'update_activity', update_activity)
+    buffer = ActivityBuffer(interval=60, max_size=100)
+    buffer.record_login(1)
+    login = buffer._pending[1][0]
+
+    assert await buffer.flush() == 0
+    assert buffer.stats()['failures'] == 1
+
+    # The login of the failed batch is kept, with the time seen during the flush.
+    assert await buffer.flush() == 1
+    assert list(batches[1]) == [(1, login, seen_meanwhile[0])]
+
+
+async def test_reaching_max_size_flushes_before_the_interval(
+    database: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    flushed = asyncio.Event()
+
+    async def update_activity(self: AuthRepository, activity: Sequence[Any]) -> None:
+        flushed.set()
+
+    monkeypatch.setattr(AuthRepository, 'update_activity', update_activity)
+    buffer = ActivityBuffer(interval=60, max_size=2)
+
+    buffer.record_seen(1)
+    await asyncio.sleep(0)
+    assert not flushed.is_set()
+
+    buffer.record_seen(2)
+    await asyncio.wait_for(flushed.wait(), timeout=1)
+    await buffer.stop()
+    assert len(buffer) == 0
+
+
+async def test_stop_writes_what_is_still_pending(create_user: UserFactory) -> None:
+    user = await create_user()
+    buffer = ActivityBuffer(interval=60, max_size=100)
+    buffer.start()
+
+    buffer.record_login(user['id'])
+    await buffer.stop()
+
+    assert (await _get_user(user['id'])).last_login_at is not None
+    assert buffer.stats()['flushes'] == 1
@@ -0,0 +1,38 @@
+import time
+
+import pytest
+
+from auth.codecs import JWT_CODECS, JWTCodec, JWTDecodeError
+
+
+@pytest.fixture(params=sorted(JWT_CODECS))
+def codec(request: pytest.FixtureRequest) -> JWTCodec:
+    return JWT_CODECS[request.param]('test-secret-key')
+
+
+def test_every_codec_accepts_the_tokens_of_the_others(codec: JWTCodec) -> None:
+    claims = {'sub': 'john_doe', 'ver': 1, 'exp': int(time.time()) + 60}
+
+    for other in JWT_CODECS.values():
+        token = other('test-secret-key').encode(dict(claims))
+        assert codec.decode(token) == claims
+
+
+def test_decode_rejects_expired_tokens(codec: JWTCodec) -> None:
+    token = codec.encode({'sub': 'john_doe', 'exp': int(time.time()) - 1})
+
+    with pytest.raises(JWTDecodeError):
+        codec.decode(token)
+
+
+def test_decode_rejects_tokens_signed_with_another_key(codec: JWTCodec) -> None:
+    token = type(codec)('another-key').encode({'sub': 'john_doe'})
+
+    with pytest.raises(JWTDecodeError):
+        codec.decode(token)
+
+
+@pytest.mark.parametrize('token', ['', 'a.b', 'a.b.c', 'é.b.c'])
+def test_decode_rejects_malformed_tokens(codec: JWTCodec, token: str) -> None:
+    with pytest.raises(JWTDecodeError):
+        codec.decode(token)
@@ -0,0 +1,62 @@
+from typing import Any, Awaitable, Callable
+
+import httpx
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+UserFactory = Callable[..., Awaitable[dict[str, Any]]]
+
+
+async def _refresh(client: httpx.AsyncClient, refresh_token: str) -> httpx.Response:
+    return await client.post('/auth/refresh', json={'refresh_token': refresh_token})
+
+
+async def test_refresh_rotates_the_refresh_token(
+    client: httpx.AsyncClient, create_user: UserFactory, login: UserFactory
+) -> None:
+    await create_user()
+    tokens = await login()
+
+    response = await _refresh(client, tokens['refresh_token'])
+
+    assert response.status_code == 200, response.text
+    rotated = response.json()['data']
+    assert rotated['refresh_token'] != tokens['refresh_token']
+    headers = {'Authorization': f'Bearer {rotated["access_token"]}'}
+    assert (await client.get('/user/me', headers=headers)).status_code == 200
+
+
+async def test_reusing_a_rotated_refresh_token_revokes_its_family(
+    client: httpx.AsyncClient, create_user: UserFactory, login: UserFactory
+) -> None:
+    await create_user()
+    tokens = await login()
+    other_login = await login()
+    rotated = (await _refresh(client, tokens['refresh_token'])).json()['data']
+
+    reused = await _refresh(client, tokens['refresh_token'])
+
+    assert reused.status_code == 401
+    assert reused.json()['data']['code'] == 'invalid_refresh_token'
+    assert (await _refresh(client, rotated['refresh_token'])).status_code == 401
+    assert (await _refresh(client, other_login['refresh_token'])).status_code == 200
+
+
+async def test_revoke_logs_the_refresh_token_family_out(
+    client: httpx.AsyncClient, create_user: UserFactory, login: UserFactory
+) -> None:
+    await create_user()
+    tokens = await login()
+    rotated = (await _refresh(client, tokens['refresh_token'])).json()['data']
+
+    response = await client.post('/auth/revoke', json={'refresh_token': tokens['refresh_token']})
+
+    assert response.json()['data'] == {'revoked': True}
+    assert (await _refresh(client, rotated['refresh_token'])).status_code == 401
+
+
+async def test_refresh_rejects_unknown_tokens(client: httpx.AsyncClient) -> None:
+    response = await _refresh(client, 'not-a-refresh-token')
+
+    assert response.status_code == 401
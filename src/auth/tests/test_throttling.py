@@ -0,0 +1,105 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+import httpx
+import pytest
+from starlette.requests import Request
+
+from auth.exceptions import JWTTooManyLoginAttempts
+from auth.throttling import InMemoryThrottleBackend, LoginThrottle, login_throttle
+
+pytestmark = pytest.mark.anyio
+
+
+def _throttle(**overrides: Any) -> LoginThrottle:
+    options: dict[str, Any] = {
+        'backend': InMemoryThrottleBackend(max_keys=100),
+        'ip_per_minute': 60,
+        'ip_burst': 10,
+        'username_per_minute': 60,
+        'username_burst': 2,
+        'max_concurrent': 10,
+    }
+    return LoginThrottle(**options | overrides)
+
+
+async def _attempt(throttle: LoginThrottle, username: str, client_ip: str) -> int | None:
+    try:
+        async with throttle.admit(username, client_ip):
+            return None
+    except JWTTooManyLoginAttempts as exc:
+        assert exc.headers is not None
+        return int(exc.headers['Retry-After'])
+
+
+def _request(client: str, forwarded_for: list[str]) -> Request:
+    headers = [(b'x-forwarded-for', value.encode()) for value in forwarded_for]
+    return Request({'type': 'http', 'client': (client, 1234), 'headers': headers})
+
+
+async def test_username_attempts_are_limited_across_client_ips() -> None:
+    throttle = _throttle()
+
+    results = [await _attempt(throttle, 'john', f'10.0.0.{index}') for index in range(3)]
+
+    assert results == [None, None, 1]
+    assert await _attempt(throttle, 'jane', '10.0.0.1') is None
+    assert throttle.stats()['rejected_username'] == 1
+
+
+async def test_client_ip_attempts_are_limited_across_usernames() -> None:
+    throttle = _throttle(ip_burst=3)
+
+    results = [await _attempt(throttle, f'user_{index}', '10.0.0.1') for index in range(4)]
+
+    assert results == [None, None, None, 1]
+    assert throttle.stats()['rejected_ip'] == 1
+
+
+async def test_logins_over_the_concurrency_cap_are_rejected() -> None:
+    throttle = _throttle(max_concurrent=1)
+    release = asyncio.Event()
+
+    async def slow_login() -> None:
+        async with throttle.admit('john', '10.0.0.1'):
+            await release.wait()
+
+    task = asyncio.ensure_future(slow_login())
+    await asyncio.sleep(0)
+
+    assert await _attempt(throttle, 'jane', '10.0.0.2') == 1
+    release.set()
+    await task
+    assert await _attempt(throttle, 'jane', '10.0.0.2') is None
+    assert throttle.stats()['in_flight'] == 0
+
+
+def test_client_ip_ignores_forwarded_for_from_untrusted_peers() -> None:
+    throttle = _throttle(trusted_proxies=['10.0.0.0/8'])
+
+    assert throttle.client_ip(_request('203.0.113.7', ['198.51.100.1'])) == '203.0.113.7'
+
+
+def test_client_ip_is_the_last_hop_before_the_trusted_proxies() -> None:
+    throttle = _throttle(trusted_proxies=['10.0.0.0/8', '192.168.1.1'])
+    forged = '198.51.100.1, 203.0.113.7'
+
+    assert throttle.client_ip(_request('10.0.0.5', [forged, '192.168.1.1'])) == '203.0.113.7'
+    assert throttle.client_ip(_request('10.0.0.5', [])) == '10.0.0.5'
+
+
+async def test_token_answers_429_with_retry_after(
+    client: httpx.AsyncClient,
+    create_user: Callable[..., Awaitable[dict[str, Any]]],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(login_throttle, '_backend', InMemoryThrottleBackend(max_keys=100))
+    monkeypatch.setattr(login_throttle, '_username_burst', 1)
+    await create_user()
+    credentials = {'username': 'john_doe', 'password': 'wrong-password'}
+
+    assert (await client.post('/auth/token', json=credentials)).status_code == 401
+    response = await client.post('/auth/token', json=credentials)
+
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) > 0
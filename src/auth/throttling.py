@@ -0,0 +1,223 @@
+import ipaddress
+import math
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Sequence
+
+from fastapi import Request
+
+from auth.constants import LOGIN_THROTTLE_MAX_KEYS, PASSWORD_HASHER_MAX_WORKERS
+from auth.exceptions import JWTTooManyLoginAttempts
+from config.settings import get_settings
+from core.cache import TTLCache
+
+_settings = get_settings()
+
+
+class ThrottleBackend(ABC):
+    """
+    Stores the token buckets of the login throttle. The in-memory backend limits each
+    process on its own, a shared backend (e.g. Redis) limits the whole deployment.
+    """
+
+    @abstractmethod
+    async def acquire(self, key: str, per_second: float, burst: int) -> float:
+        """
+        Takes a token from the bucket of the key.
+
+        Args:
+            key (str): The bucket identity, e.g. `ip:10.0.0.1`.
+            per_second (float): Tokens the bucket regains per second.
+            burst (int): Capacity of the bucket, a new bucket starts full.
+
+        Returns:
+            float: 0 if a token was taken, otherwise the seconds until one is available.
+        """
+        pass
+
+
+class InMemoryThrottleBackend(ThrottleBackend):
+    """
+    Token buckets kept in a bounded in-process cache. A bucket expires once it would be full
+    again, so only the keys that were throttled recently take memory.
+    """
+
+    def __init__(self, max_keys: int) -> None:
+        """
+        Initializes a new instance of the InMemoryThrottleBackend class.
+
+        Args:
+            max_keys (int): Maximum number of buckets kept before evicting the least recently used.
+        """
+        self._buckets: TTLCache[str, tuple[float, float]] = TTLCache(max_size=max_keys, ttl=0)
+
+    async def acquire(self, key: str, per_second: float, burst: int) -> float:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+
+        if bucket is None:
+            tokens = float(burst)
+        else:
+            tokens, updated_at = bucket
+            tokens = min(float(burst), tokens + (now - updated_at) * per_second)
+
+        if tokens < 1:
+            self._buckets.set(key, (tokens, now), ttl=(burst - tokens) / per_second)
+            return (1 - tokens) / per_second
+
+        tokens -= 1
+        self._buckets.set(key, (tokens, now), ttl=(burst - tokens) / per_second)
+        return 0.0
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns the number of buckets kept.
+
+        Returns:
+            dict[str, int]: The backend counters.
+        """
+        return {'buckets': len(self._buckets)}
+
+
+class LoginThrottle:
+    """
+    Admission control of the login endpoint. Attempts are limited per client IP, and per
+    username whatever the client IP, with token buckets, and the logins verifying a password
+    at the same time are capped, so a burst is rejected before it reaches the password
+    hasher. The username buckets stop credential stuffing spread over many addresses, their
+    burst bounds how long someone else's attempts can lock a user out.
+    """
+
+    def __init__(
+        self,
+        backend: ThrottleBackend,
+        ip_per_minute: float,
+        ip_burst: int,
+        username_per_minute: float,
+        username_burst: int,
+        max_concurrent: int,
+        trusted_proxies: Sequence[str] = (),
+    ) -> None:
+        """
+        Initializes a new instance of the LoginThrottle class.
+
+        Args:
+            backend (ThrottleBackend): The token bucket storage.
+            ip_per_minute (float): Attempts a client IP regains per minute.
+            ip_burst (int): Attempts a client IP can make at once.
+            username_per_minute (float): Attempts a username regains per minute.
+            username_burst (int): Attempts a username can receive at once.
+            max_concurrent (int): Logins admitted at the same time.
+            trusted_proxies (Sequence[str]): Addresses or networks of the proxies whose
+                X-Forwarded-For header is trusted.
+        """
+        self._backend = backend
+        self._ip_per_second = ip_per_minute / 60
+        self._ip_burst = ip_burst
+        self._username_per_second = username_per_minute / 60
+        self._username_burst = username_burst
+        self._max_concurrent = max_concurrent
+        self._trusted_proxies = tuple(
+            ipaddress.ip_network(proxy, strict=False) for proxy in trusted_proxies
+        )
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected_ip = 0
+        self.rejected_username = 0
+        self.rejected_concurrency = 0
+
+    def _is_trusted_proxy(self, address: str) -> bool:
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+
+        return any(ip in network for network in self._trusted_proxies)
+
+    def client_ip(self, request: Request) -> str:
+        """
+        Returns the IP of the client making a request. Behind trusted proxies it is the last
+        X-Forwarded-For hop that is not a trusted proxy, the hops before it can be forged.
+
+        Args:
+            request (Request): The request.
+
+        Returns:
+            str: The IP address of the client.
+        """
+        address = request.client.host if request.client else 'unknown'
+        if not self._is_trusted_proxy(address):
+            return address
+
+        forwarded = ','.join(request.headers.getlist('x-forwarded-for'))
+        for hop in reversed([hop.strip() for hop in forwarded.split(',') if hop.strip()]):
+            address = hop
+            if not self._is_trusted_proxy(hop):
+                break
+
+        return address
+
+    @asynccontextmanager
+    async def admit(self, username: str, client_ip: str) -> AsyncIterator[None]:
+        """
+        Admits a login attempt for the duration of the block, or rejects it.
+
+        Args:
+            username (str): The username the attempt is for.
+            client_ip (str): The IP address of the client.
+
+        Raises:
+            JWTTooManyLoginAttempts: If a bucket is empty or too many logins are in flight.
+        """
+        self.in_flight += 1
+        try:
+            if self.in_flight > self._max_concurrent:
+                self.rejected_concurrency += 1
+                raise JWTTooManyLoginAttempts(retry_after=1)
+
+            retry_after = await self._backend.acquire(
+                f'ip:{client_ip}', self._ip_per_second, self._ip_burst
+            )
+            if retry_after:
+                self.rejected_ip += 1
+                raise JWTTooManyLoginAttempts(retry_after=math.ceil(retry_after))
+
+            retry_after = await self._backend.acquire(
+                f'username:{username}', self._username_per_second, self._username_burst
+            )
+            if retry_after:
+                self.rejected_username += 1
+                raise JWTTooManyLoginAttempts(retry_after=math.ceil(retry_after))
+
+            self.admitted += 1
+            yield
+        finally:
+            self.in_flight -= 1
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Returns the admission counters.
+
+        Returns:
+            dict[str, Any]: Logins in flight, admitted and rejected by reason.
+        """
+        return {
+            'max_concurrent': self._max_concurrent,
+            'in_flight': self.in_flight,
+            'admitted': self.admitted,
+            'rejected_ip': self.rejected_ip,
+            'rejected_username': self.rejected_username,
+            'rejected_concurrency': self.rejected_concurrency,
+        }
+
+
+login_throttle = LoginThrottle(
+    backend=InMemoryThrottleBackend(max_keys=LOGIN_THROTTLE_MAX_KEYS),
+    ip_per_minute=_settings.auth_config.login_ip_per_minute,
+    ip_burst=_settings.auth_config.login_ip_burst,
+    username_per_minute=_settings.auth_config.login_username_per_minute,
+    username_burst=_settings.auth_config.login_username_burst,
+    max_concurrent=_settings.auth_config.login_max_concurrent or 2 * PASSWORD_HASHER_MAX_WORKERS,
+    trusted_proxies=_settings.auth_config.login_trusted_proxies,
+)
@@ -1,11 +1,38 @@
-from passlib.context import CryptContext  # type: ignore
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, TypeVar
 
+from auth.constants import PASSWORD_HASHER_MAX_WORKERS
 from config.settings import get_settings
 
 _settings = get_settings()
 
+_T = TypeVar('_T')
 
-pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
+
+@lru_cache
+def get_pwd_context() -> Any:
+    """
+    Builds the passlib context on first use, so passlib and bcrypt are not imported
+    when the application starts. New hashes use the configured bcrypt cost, and hashes
+    with any other cost are reported by `needs_update`.
+
+    Returns:
+        CryptContext: The password hashing context.
+    """
+    from passlib.context import CryptContext  # type: ignore
+
+    rounds = _settings.auth_config.bcrypt_rounds
+
+    return CryptContext(
+        schemes=['bcrypt'],
+        deprecated='auto',
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
 
 
 def get_password_hash(password: str, salt: str) -> str:
@@ -21,7 +48,7 @@ def get_password_hash(password: str, salt: str) -> str:
     """
 
     new_text = f'{_settings.secret_key}{password}{salt}'
-    password_hashed: str = pwd_context.hash(new_text)
+    password_hashed: str = get_pwd_context().hash(new_text)
 
     return password_hashed
 
@@ -41,6 +68,159 @@ def verify_password(plain_password: str, salt: str, hashed_password: str) -> boo
 
     new_text = f'{_settings.secret_key}{plain_password}{salt}'
 
-    check_password: bool = pwd_context.verify(new_text, hashed_password)
+    check_password: bool = get_pwd_context().verify(new_text, hashed_password)
 
     return check_password
+
+
+def verify_and_update_password(
+    plain_password: str, salt: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Verify the provided password against the hashed password, and rehash it if the hash
+    does not follow the current hashing policy.
+
+    Args:
+        plain_password (str): The plain text password.
+        salt (str): Salt value for hashing.
+        hashed_password (str): The hashed password.
+
+    Returns:
+        tuple[bool, str | None]: Whether the password matches, and the new hash to store
+            if the password matches and the hash is outdated.
+    """
+
+    new_text = f'{_settings.secret_key}{plain_password}{salt}'
+
+    result: tuple[bool, str | None] = get_pwd_context().verify_and_update(new_text, hashed_password)
+
+    return result
+
+
+class PasswordHasher:
+    """
+    Runs password hashing in a dedicated, bounded thread pool so bcrypt never blocks
+    the event loop. bcrypt releases the GIL, so the workers hash in parallel across cores.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        """
+        Initializes a new instance of the PasswordHasher class.
+
+        Args:
+            max_workers (int): Maximum number of hashes computed at the same time.
+        """
+        self._max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='password-hasher',
+        )
+        self.pending = 0
+        self.calls = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.run_time_total = 0.0
+        self.run_time_max = 0.0
+
+    async def run(self, func: Callable[..., _T], *args: Any) -> _T:
+        """
+        Runs a hashing function in the pool and waits for its result.
+
+        Args:
+            func (Callable[..., _T]): The blocking hashing function.
+            *args (Any): The arguments of the function.
+
+        Returns:
+            _T: The result of the function.
+        """
+        queued_at = time.perf_counter()
+
+        def timed() -> tuple[_T, float, float]:
+            started_at = time.perf_counter()
+            result = func(*args)
+            return result, started_at - queued_at, time.perf_counter() - started_at
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, wait_time, run_time = await loop.run_in_executor(self._executor, timed)
+        finally:
+            self.pending -= 1
+
+        self.calls += 1
+        self.wait_time_total += wait_time
+        self.wait_time_max = max(self.wait_time_max, wait_time)
+        self.run_time_total += run_time
+        self.run_time_max = max(self.run_time_max, run_time)
+
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Returns the queue depth and latency counters, times are in seconds.
+
+        Returns:
+            dict[str, Any]: The hasher counters.
+        """
+        return {
+            'max_workers': self._max_workers,
+            'in_flight': min(self.pending, self._max_workers),
+            'queue_depth': max(self.pending - self._max_workers, 0),
+            'calls': self.calls,
+            'wait_time_total': self.wait_time_total,
+            'wait_time_max': self.wait_time_max,
+            'run_time_total': self.run_time_total,
+            'run_time_max': self.run_time_max,
+        }
+
+
+password_hasher = PasswordHasher(max_workers=PASSWORD_HASHER_MAX_WORKERS)
+
+
+async def get_password_hash_async(password: str, salt: str) -> str:
+    """
+    Generate a password hash in the password hasher pool.
+
+    Args:
+        password (str): The password to be hashed.
+        salt (str): Salt value for hashing.
+
+    Returns:
+        str: The hashed password.
+    """
+    return await password_hasher.run(get_password_hash, password, salt)
+
+
+async def verify_password_async(plain_password: str, salt: str, hashed_password: str) -> bool:
+    """
+    Verify the provided password against the hashed password in the password hasher pool.
+
+    Args:
+        plain_password (str): The plain text password.
+        salt (str): Salt value for hashing.
+        hashed_password (str): The hashed password.
+
+    Returns:
+        bool: True if the password matches, False otherwise.
+    """
+    return await password_hasher.run(verify_password, plain_password, salt, hashed_password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, salt: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Verify the provided password and rehash an outdated hash in the password hasher pool.
+
+    Args:
+        plain_password (str): The plain text password.
+        salt (str): Salt value for hashing.
+        hashed_password (str): The hashed password.
+
+    Returns:
+        tuple[bool, str | None]: Whether the password matches, and the new hash to store
+            if the hash is outdated.
+    """
+    return await password_hasher.run(
+        verify_and_update_password, plain_password, salt, hashed_password
+    )
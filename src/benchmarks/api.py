@@ -0,0 +1,281 @@
+"""
+Benchmarks of the API hot paths.
+
+Boots `main:app` in-process behind an ASGI client, seeds a local database and reports the
+throughput and latency percentiles of each endpoint as JSON, so runs can be compared
+between commits.
+
+Run it from `src`:
+
+    python -m benchmarks.api --users 1000 --requests 500 --output bench.json
+    python -m benchmarks.api --baseline bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, cast
+
+BENCHMARK_PASSWORD = 'benchmark-password'
+BENCHMARK_CREATED_AT = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class EndpointResult:
+    requests: int
+    errors: int
+    throughput_rps: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    if not sorted_values:
+        return 0.0
+
+    index = min(len(sorted_values) - 1, round(percent / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+async def _measure(
+    name: str,
+    request: Callable[[int], Awaitable[int]],
+    requests: int,
+    concurrency: int,
+    expected_status: int,
+) -> EndpointResult:
+    """
+    Sends `requests` requests with `concurrency` workers and collects their latencies.
+
+    Args:
+        name (str): The endpoint label, only used for progress output.
+        request (Callable[[int], Awaitable[int]]): Sends the i-th request, returns its status.
+        requests (int): The number of requests to send.
+        concurrency (int): The number of requests in flight at once.
+        expected_status (int): Any other status is counted as an error.
+
+    Returns:
+        EndpointResult: The throughput and latency statistics of the endpoint.
+    """
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for index in counter:
+            start = time.perf_counter()
+            status_code = await request(index)
+            latencies.append(time.perf_counter() - start)
+            if status_code != expected_status:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f'{name}: {requests} requests in {elapsed:.2f}s', file=sys.stderr)
+
+    return EndpointResult(
+        requests=requests,
+        errors=errors,
+        throughput_rps=round(requests / elapsed, 2),
+        mean_ms=round(sum(latencies) / len(latencies) * 1000, 3),
+        p50_ms=round(_percentile(latencies, 50) * 1000, 3),
+        p95_ms=round(_percentile(latencies, 95) * 1000, 3),
+        p99_ms=round(_percentile(latencies, 99) * 1000, 3),
+    )
+
+
+async def _seed(users: int) -> None:
+    """
+    Creates the tables and inserts the benchmark users. They all share the same `created_at`,
+    which is the password salt, so the password is hashed only once.
+
+    Args:
+        users (int): The number of users to insert.
+    """
+    from sqlmodel import SQLModel, insert, select, update
+
+    from auth.utils import get_password_hash
+    from database.session import async_engine
+    from user.models import User
+
+    rows = [
+        {
+            'username': f'bench_{index}',
+            'first_name': 'Bench',
+            'last_name': f'User {index}',
+            'email': f'bench_{index}@example.com',
+            'created_at': BENCHMARK_CREATED_AT,
+            'updated_at': BENCHMARK_CREATED_AT,
+        }
+        for index in range(users)
+    ]
+
+    async with async_engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.drop_all)
+        await connection.run_sync(SQLModel.metadata.create_all)
+        await connection.execute(insert(User), rows)
+
+        # The salt is `created_at` as the driver returns it, which may drop the time zone.
+        created_at = (await connection.execute(select(User.created_at).limit(1))).scalar_one()
+        hashed_password = get_password_hash(BENCHMARK_PASSWORD, created_at.isoformat())
+        await connection.execute(update(User).values(hashed_password=hashed_password))
+
+
+async def run(users: int, requests: int, concurrency: int) -> dict[str, EndpointResult]:
+    """
+    Seeds the database and benchmarks the hot paths of the API.
+
+    Args:
+        users (int): The number of users to seed.
+        requests (int): The number of requests per endpoint.
+        concurrency (int): The number of requests in flight at once.
+
+    Returns:
+        dict[str, EndpointResult]: The results keyed by endpoint.
+    """
+    import httpx
+
+    from database.session import async_engine
+    from main import app
+
+    await _seed(users)
+
+    # httpx types the ASGI messages as dict and Starlette as MutableMapping, both are the same.
+    transport = httpx.ASGITransport(app=cast(Any, app))
+    client = httpx.AsyncClient(transport=transport, base_url='http://benchmark')
+
+    try:
+        credentials = {'username': 'bench_0', 'password': BENCHMARK_PASSWORD}
+        response = await client.post('/auth/token', json=credentials)
+        response.raise_for_status()
+        headers = {'Authorization': f'Bearer {response.json()["data"]["access_token"]}'}
+
+        async def token(index: int) -> int:
+            credentials = {'username': f'bench_{index % users}', 'password': BENCHMARK_PASSWORD}
+            return (await client.post('/auth/token', json=credentials)).status_code
+
+        async def me(index: int) -> int:
+            return (await client.get('/user/me', headers=headers)).status_code
+
+        async def list_users(index: int) -> int:
+            return (await client.get('/user', headers=headers)).status_code
+
+        async def create_user(index: int) -> int:
+            body = {
+                'username': f'created_{index}',
+                'first_name': 'Created',
+                'last_name': f'User {index}',
+                'email': f'created_{index}@example.com',
+                'password': BENCHMARK_PASSWORD,
+                'verify_password': BENCHMARK_PASSWORD,
+            }
+            return (await client.post('/user', json=body, headers=headers)).status_code
+
+        return {
+            'POST /auth/token': await _measure(
+                'POST /auth/token', token, requests, concurrency, 200
+            ),
+            'GET /user/me': await _measure('GET /user/me', me, requests, concurrency, 200),
+            'GET /user': await _measure('GET /user', list_users, requests, concurrency, 200),
+            'POST /user': await _measure('POST /user', create_user, requests, concurrency, 201),
+        }
+    finally:
+        await client.aclose()
+        await async_engine.dispose()
+
+
+def _git_revision() -> str | None:
+    try:
+        output = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, check=True, text=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return output.stdout.strip()
+
+
+def _compare(results: dict[str, Any], baseline: dict[str, Any]) -> None:
+    print(f'{"endpoint":<20} {"metric":<16} {"baseline":>12} {"current":>12} {"change":>9}')
+
+    for endpoint, current in results.items():
+        previous = baseline.get(endpoint)
+        if previous is None:
+            continue
+
+        for metric in ('throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms'):
+            change = (current[metric] - previous[metric]) / previous[metric] * 100
+            print(
+                f'{endpoint:<20} {metric:<16} {previous[metric]:>12.3f} '
+                f'{current[metric]:>12.3f} {change:>+8.1f}%'
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the API hot paths.')
+    parser.add_argument('--users', type=int, default=1000, help='Number of users to seed.')
+    parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint.')
+    parser.add_argument('--concurrency', type=int, default=10, help='Requests in flight.')
+    parser.add_argument(
+        '--database-url',
+        help='Throwaway database, its tables are dropped. Defaults to a temporary SQLite file.',
+    )
+    parser.add_argument('--output', help='Write the JSON results to this file.')
+    parser.add_argument('--baseline', help='Compare against the JSON results of a previous run.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Settings are read at import time, so the environment is set before importing the app.
+        os.environ['DATABASE_URL'] = args.database_url or (
+            f'sqlite+aiosqlite:///{os.path.join(directory, "benchmark.db")}'
+        )
+        os.environ.setdefault('SECRET_KEY', 'benchmark')
+        os.environ.setdefault('VERSION', 'benchmark')
+        os.environ.setdefault('ENVIRONMENT', 'production')
+        # The benchmark logs in from one client far above the login throttle limits.
+        for name in ('LOGIN_IP_BURST', 'LOGIN_USERNAME_BURST', 'LOGIN_MAX_CONCURRENT'):
+            os.environ.setdefault(name, str(1_000_000))
+
+        results = asyncio.run(run(args.users, args.requests, args.concurrency))
+
+    report = {
+        'meta': {
+            'revision': _git_revision(),
+            'date': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'database': os.environ['DATABASE_URL'].split(':', 1)[0],
+            'users': args.users,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+        },
+        'results': {endpoint: asdict(result) for endpoint, result in results.items()},
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output)
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            _compare(report['results'], json.load(file)['results'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Import-time profile of the application.
+
+Imports `main` in a fresh interpreter with `python -X importtime` and reports the total
+startup import time and the slowest modules, as a table or as JSON.
+
+Run it from `src`:
+
+    python -m benchmarks.importtime --top 25
+    python -m benchmarks.importtime --json > importtime.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from dataclasses import asdict, dataclass
+
+
+@dataclass
+class ModuleImport:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def profile(module: str) -> list[ModuleImport]:
+    """
+    Imports the module in a subprocess with `-X importtime` and parses its report.
+
+    Args:
+        module (str): The module to import.
+
+    Returns:
+        list[ModuleImport]: Every module imported, in import order.
+    """
+    environment = {
+        'DATABASE_URL': 'sqlite+aiosqlite:///:memory:',
+        'SECRET_KEY': 'importtime',
+        'VERSION': 'importtime',
+        **os.environ,
+    }
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        check=True,
+        env=environment,
+        text=True,
+    )
+
+    imports: list[ModuleImport] = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        self_us, cumulative_us, name = line.removeprefix('import time:').split('|')
+        imports.append(
+            ModuleImport(
+                module=name.strip(),
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=(len(name) - len(name.lstrip()) - 1) // 2,
+            )
+        )
+
+    return imports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Profile the import time of the application.')
+    parser.add_argument('--module', default='main', help='Module to import.')
+    parser.add_argument('--top', type=int, default=20, help='Number of modules to report.')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON.')
+    args = parser.parse_args()
+
+    imports = profile(args.module)
+    total_us = sum(entry.cumulative_us for entry in imports if entry.depth == 0)
+    slowest = sorted(imports, key=lambda entry: entry.self_us, reverse=True)[: args.top]
+    packages: dict[str, int] = {}
+    for entry in imports:
+        package = entry.module.split('.')[0]
+        packages[package] = packages.get(package, 0) + entry.self_us
+
+    if args.json:
+        report = {
+            'module': args.module,
+            'total_us': total_us,
+            'modules': len(imports),
+            'packages': dict(sorted(packages.items(), key=lambda item: item[1], reverse=True)),
+            'slowest': [asdict(entry) for entry in slowest],
+        }
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f'import {args.module}: {total_us / 1000:.1f} ms, {len(imports)} modules\n')
+    print(f'{"package":<40} {"self ms":>10}')
+    for package, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[
+        : args.top
+    ]:
+        print(f'{package:<40} {self_us / 1000:>10.1f}')
+
+    print(f'\n{"module":<60} {"self ms":>10} {"cumulative ms":>14}')
+    for entry in slowest:
+        print(
+            f'{entry.module:<60} {entry.self_us / 1000:>10.1f} {entry.cumulative_us / 1000:>14.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
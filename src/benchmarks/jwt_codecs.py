@@ -0,0 +1,116 @@
+"""
+Microbenchmark of the JWT codecs.
+
+Encodes and decodes a token with the claims of a real access token through every codec
+backend and reports their throughput as a table or as JSON. Backends whose library is
+not installed are skipped.
+
+Run it from `src`:
+
+    python -m benchmarks.jwt_codecs --iterations 20000
+    python -m benchmarks.jwt_codecs --json > jwt_codecs.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+BENCHMARK_KEY = 'benchmark-secret-key-of-at-least-32-bytes'
+
+
+@dataclass
+class CodecResult:
+    encode_ops: float
+    decode_ops: float
+    token_bytes: int
+
+
+def _claims() -> dict[str, Any]:
+    return {
+        'sub': 'john_doe',
+        'user': {
+            'id': 1,
+            'username': 'john_doe',
+            'email': 'john@example.com',
+            'first_name': 'John',
+            'last_name': 'Doe',
+            'full_name': 'John Doe',
+        },
+        'active': True,
+        'ver': 0,
+        'exp': int(time.time()) + 3600,
+    }
+
+
+def _ops_per_second(func: Callable[[], Any], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return round(iterations / (time.perf_counter() - start), 1)
+
+
+def run(iterations: int) -> dict[str, CodecResult]:
+    """
+    Benchmarks every installed codec backend. The tokens of each backend are checked
+    to decode with the others, so only interchangeable backends are compared.
+
+    Args:
+        iterations (int): The number of encodes and decodes per backend.
+
+    Returns:
+        dict[str, CodecResult]: The results keyed by backend name.
+    """
+    from auth.codecs import JWT_CODECS, JWTCodec
+
+    codecs: dict[str, JWTCodec] = {}
+    for name, codec_class in JWT_CODECS.items():
+        codec = codec_class(BENCHMARK_KEY)
+        try:
+            codec.encode(_claims())
+        except ImportError:
+            print(f'{name}: not installed, skipped', file=sys.stderr)
+            continue
+        codecs[name] = codec
+
+    results: dict[str, CodecResult] = {}
+    for name, codec in codecs.items():
+        claims = _claims()
+        token = codec.encode(claims)
+        for other_name, other in codecs.items():
+            if other.decode(token) != claims:
+                raise RuntimeError(f'{other_name} does not decode the tokens of {name}')
+
+        results[name] = CodecResult(
+            encode_ops=_ops_per_second(lambda: codec.encode(_claims()), iterations),
+            decode_ops=_ops_per_second(lambda: codec.decode(token), iterations),
+            token_bytes=len(token),
+        )
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the JWT codec backends.')
+    parser.add_argument('--iterations', type=int, default=10000, help='Operations per backend.')
+    parser.add_argument('--json', action='store_true', help='Print the results as JSON.')
+    args = parser.parse_args()
+
+    results = run(args.iterations)
+
+    if args.json:
+        print(json.dumps({name: asdict(result) for name, result in results.items()}, indent=2))
+        return
+
+    print(f'{"codec":<8} {"encode/s":>12} {"decode/s":>12} {"bytes":>7}')
+    for name, result in results.items():
+        print(
+            f'{name:<8} {result.encode_ops:>12.1f} {result.decode_ops:>12.1f} '
+            f'{result.token_bytes:>7}'
+        )
+
+
+if __name__ == '__main__':
+    main()
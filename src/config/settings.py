@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 
 from config.environments import (
     AppBaseSettings,
@@ -9,9 +10,12 @@ from config.environments import (
 )
 
 
+@lru_cache
 def get_settings() -> AppBaseSettings:
     """
     This function is going to return the settings class based on the environment variable.
+    Settings are resolved once per process and shared. `get_settings.cache_clear()` only
+    affects later calls, the modules that read the settings on import keep the old ones.
     """
     environment = os.getenv('ENVIRONMENT', EnvironmentStages.DEVELOPMENT)
     match environment:
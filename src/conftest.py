@@ -0,0 +1,107 @@
+import os
+import tempfile
+from typing import Any, AsyncIterator, Awaitable, Callable, cast
+
+# The settings are read on import, so the test environment is set before the application
+# modules are collected.
+_database_directory = tempfile.mkdtemp(prefix='open-gym-tests-')
+os.environ.setdefault('DATABASE_URL', f'sqlite+aiosqlite:///{_database_directory}/test.db')
+os.environ.setdefault('SECRET_KEY', 'test-secret-key')
+os.environ.setdefault('VERSION', '0.0.0')
+os.environ.setdefault('BCRYPT_ROUNDS', '4')
+# The login throttle has its own tests, the other tests log in as often as they need.
+os.environ.setdefault('LOGIN_IP_BURST', '1000000')
+os.environ.setdefault('LOGIN_USERNAME_BURST', '1000000')
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+TEST_PASSWORD = 'test-password'
+
+CreateUser = Callable[..., Awaitable[dict[str, Any]]]
+Login = Callable[..., Awaitable[dict[str, Any]]]
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return 'asyncio'
+
+
+@pytest.fixture
+async def database() -> AsyncIterator[None]:
+    """
+    Creates the tables in an empty database, and empties the in-process caches that could
+    hold rows of a previous test.
+    """
+    import database.models  # noqa: F401, registers every table on the metadata
+    from auth.cache import principal_cache, token_state_cache
+    from database.session import async_engine
+
+    principal_cache.clear()
+    token_state_cache.clear()
+
+    async with async_engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.drop_all)
+        await connection.run_sync(SQLModel.metadata.create_all)
+
+    yield
+
+    await async_engine.dispose()
+
+
+@pytest.fixture
+async def client(database: None) -> AsyncIterator[httpx.AsyncClient]:
+    from main import app
+
+    # httpx types the ASGI messages as dict and Starlette as MutableMapping, both are the same.
+    transport = httpx.ASGITransport(app=cast(Any, app))
+    async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+        yield client
+
+
+@pytest.fixture
+def create_user(database: None) -> CreateUser:
+    """
+    Returns a function creating a user with `TEST_PASSWORD`, through the user service.
+    """
+    from database.session import async_session_factory
+    from user.schemas.requests import UserCreateRequestBody
+    from user.services.general import UserGeneralService
+    from user.services.repository import UserRepository
+
+    async def create(username: str = 'john_doe', **fields: Any) -> dict[str, Any]:
+        data = UserCreateRequestBody(
+            username=username,
+            first_name=fields.pop('first_name', 'John'),
+            last_name=fields.pop('last_name', 'Doe'),
+            email=fields.pop('email', f'{username}@example.com'),
+            password=TEST_PASSWORD,
+            verify_password=TEST_PASSWORD,
+        )
+
+        async with async_session_factory() as session:
+            user = await UserGeneralService(UserRepository(session)).create(data)
+
+        return user.model_dump()
+
+    return create
+
+
+@pytest.fixture
+def login(client: httpx.AsyncClient) -> Login:
+    """
+    Returns a function logging a user created by `create_user` in, and returning the token
+    response data.
+    """
+
+    async def login(username: str = 'john_doe') -> dict[str, Any]:
+        response = await client.post(
+            '/auth/token', json={'username': username, 'password': TEST_PASSWORD}
+        )
+        assert response.status_code == 200, response.text
+
+        data: dict[str, Any] = response.json()['data']
+        return data
+
+    return login
@@ -0,0 +1,106 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+_K = TypeVar('_K', bound=Hashable)
+_V = TypeVar('_V')
+
+
+class TTLCache(Generic[_K, _V]):
+    """
+    Bounded in-process cache with per-entry expiration and LRU eviction.
+    It is not thread safe, it is meant to be used from the event loop only.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        """
+        Initializes a new instance of the TTLCache class.
+
+        Args:
+            max_size (int): Maximum number of entries kept before evicting the least recently used.
+            ttl (float): Seconds an entry stays valid after being set.
+        """
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: OrderedDict[_K, tuple[float, _V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: _K) -> _V | None:
+        """
+        Gets a value from the cache.
+
+        Args:
+            key (_K): The key to look up.
+
+        Returns:
+            _V | None: The cached value, or None if it is missing or expired.
+        """
+        entry = self._entries.get(key)
+
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: _K, value: _V, ttl: float | None = None) -> None:
+        """
+        Sets a value in the cache, evicting the least recently used entry if it is full.
+
+        Args:
+            key (_K): The key to store the value under.
+            value (_V): The value to store.
+            ttl (float | None): Seconds the entry stays valid. Defaults to the cache TTL.
+        """
+        expires_at = time.monotonic() + (self._ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: _K) -> None:
+        """
+        Removes a value from the cache if it is present.
+
+        Args:
+            key (_K): The key to remove.
+        """
+        self._entries.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[_K, _V], bool]) -> None:
+        """
+        Removes every entry matching the predicate.
+
+        Args:
+            predicate (Callable[[_K, _V], bool]): Receives the key and value of every entry.
+        """
+        for key in [k for k, (_, v) in self._entries.items() if predicate(k, v)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """
+        Removes every entry from the cache.
+        """
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict[str, int]: Current size, hits and misses.
+        """
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
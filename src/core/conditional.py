@@ -0,0 +1,97 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from fastapi import Request, Response, status
+
+
+def is_conditional(request: Request) -> bool:
+    """
+    Checks whether the request carries `If-None-Match` or `If-Modified-Since` validators.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        bool: True if the client sent a conditional request.
+    """
+    return 'if-none-match' in request.headers or 'if-modified-since' in request.headers
+
+
+class ResourceValidators:
+    """
+    ETag and Last-Modified validators of a resource, derived from its key and modification time.
+    """
+
+    def __init__(self, key: Any, last_modified: datetime | None) -> None:
+        """
+        Initializes a new instance of the ResourceValidators class.
+
+        Args:
+            key (Any): The identity of the resource, usually its ID.
+            last_modified (datetime | None): When the resource was last modified.
+        """
+        if last_modified is not None and last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+
+        version = int(last_modified.timestamp() * 1_000_000) if last_modified else 0
+
+        self.etag = f'W/"{key}-{version:x}"'
+        self.last_modified = last_modified
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """
+        Returns the validator headers, clients must revalidate before reusing the response.
+
+        Returns:
+            dict[str, str]: The ETag, Last-Modified and Cache-Control headers.
+        """
+        headers = {'ETag': self.etag, 'Cache-Control': 'private, no-cache'}
+
+        if self.last_modified is not None:
+            headers['Last-Modified'] = format_datetime(
+                self.last_modified.astimezone(timezone.utc), usegmt=True
+            )
+
+        return headers
+
+    def is_not_modified(self, request: Request) -> bool:
+        """
+        Evaluates the request validators, `If-None-Match` takes precedence over
+        `If-Modified-Since` as defined in RFC 9110.
+
+        Args:
+            request (Request): The incoming request.
+
+        Returns:
+            bool: True if the client copy is still current.
+        """
+        if_none_match = request.headers.get('if-none-match')
+        if if_none_match is not None:
+            opaque_tag = self.etag.removeprefix('W/')
+            tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+            return '*' in tags or opaque_tag in tags
+
+        if_modified_since = request.headers.get('if-modified-since')
+        if if_modified_since is None or self.last_modified is None:
+            return False
+
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+
+        return self.last_modified.replace(microsecond=0) <= since
+
+    def not_modified(self) -> Response:
+        """
+        Builds the empty `304 Not Modified` response.
+
+        Returns:
+            Response: The response carrying only the validator headers.
+        """
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self.headers)
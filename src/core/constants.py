@@ -0,0 +1,26 @@
+PAGINATION_DEFAULT_LIMIT = 50
+PAGINATION_MAX_LIMIT = 200
+ERROR_RESPONSE_CACHE_MAX_SIZE = 256
+METRICS_LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+__all__ = [
+    'ERROR_RESPONSE_CACHE_MAX_SIZE',
+    'METRICS_LATENCY_BUCKETS',
+    'PAGINATION_DEFAULT_LIMIT',
+    'PAGINATION_MAX_LIMIT',
+]
@@ -1,10 +1,28 @@
+from typing import Optional
+
+from fastapi import status
 from fastapi.exceptions import HTTPException
 
 
 class APIHTTPException(HTTPException):
-    def __init__(self, detail: str, error_code: str, status_code: int) -> None:
+    def __init__(
+        self,
+        detail: str,
+        error_code: str,
+        status_code: int,
+        headers: Optional[dict[str, str]] = None,
+    ) -> None:
         error = {
             'code': error_code,
             'description': detail,
         }
-        super().__init__(status_code=status_code, detail=error)
+        super().__init__(status_code=status_code, detail=error, headers=headers)
+
+
+class InvalidCursorException(APIHTTPException):
+    def __init__(self) -> None:
+        super().__init__(
+            detail='Invalid pagination cursor provided.',
+            error_code='invalid_cursor',
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
@@ -1,8 +1,12 @@
-from fastapi import Request, status
+from functools import lru_cache
+from typing import Mapping
+
+from fastapi import Request, Response, status
 from fastapi.exceptions import ValidationException
-from pydantic_core import ValidationError
+from pydantic_core import ValidationError, to_json
 
 from config.settings import get_settings
+from core.constants import ERROR_RESPONSE_CACHE_MAX_SIZE
 from core.exceptions.exceptions import APIHTTPException
 from core.responses import CJSONResponse
 from core.schemas.responses import ErrorResponse, ResponseSchema
@@ -10,15 +14,48 @@ from core.schemas.responses import ErrorResponse, ResponseSchema
 _setting = get_settings()
 
 
-def http_exception_handler(request: Request, exc: Exception) -> CJSONResponse:
+@lru_cache(maxsize=ERROR_RESPONSE_CACHE_MAX_SIZE)
+def render_error(status_code: int, code: str, description: str) -> bytes:
+    """
+    Renders the body of an error response. Errors with a fixed body are rendered once
+    and then served from the cache, so a burst of identical errors skips the pydantic
+    models and the JSON encoding.
+
+    Args:
+        status_code (int): The HTTP status code.
+        code (str): The error code.
+        description (str): The error description.
+
+    Returns:
+        bytes: The JSON encoded body.
+    """
+    response = ResponseSchema(
+        code=-1,
+        data=ErrorResponse(code=code, description=description),
+        status_code=status_code,
+    )
+
+    return to_json(response, exclude={'status_code'})
+
+
+def _error_response(
+    status_code: int, code: str, description: str, headers: Mapping[str, str] | None = None
+) -> Response:
+    return Response(
+        content=render_error(status_code, code, description),
+        status_code=status_code,
+        headers=headers,
+        media_type='application/json',
+    )
+
+
+def http_exception_handler(request: Request, exc: Exception) -> Response:
     if isinstance(exc, APIHTTPException):
-        response = ResponseSchema(
-            code=-1,
-            data=ErrorResponse(
-                code=exc.detail.get('code', 'unknown_error'),  # type: ignore [attr-defined]
-                description=exc.detail.get('description', 'Unknown error'),  # type: ignore [attr-defined]
-            ),
-            status_code=exc.status_code,
+        return _error_response(
+            exc.status_code,
+            exc.detail.get('code', 'unknown_error'),  # type: ignore [attr-defined]
+            exc.detail.get('description', 'Unknown error'),  # type: ignore [attr-defined]
+            exc.headers,
         )
 
     elif isinstance(exc, ValidationException) or isinstance(exc, ValidationError):
@@ -26,7 +63,7 @@ def http_exception_handler(request: Request, exc: Exception) -> CJSONResponse:
         loc: tuple[str, ...] = error.get('loc')  # type: ignore
 
         msg = f'{error.get('msg', 'Validation error')} at '
-        msg += '> '.join(loc) if loc else 'unknown location'
+        msg += '> '.join(str(part) for part in loc) if loc else 'unknown location'
 
         response = ResponseSchema(
             code=-1,
@@ -46,13 +83,10 @@ def http_exception_handler(request: Request, exc: Exception) -> CJSONResponse:
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
     else:
-        response = ResponseSchema(
-            code=-1,
-            data=ErrorResponse(
-                code='internal_server_error',
-                description='Internal server error',
-            ),
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        return _error_response(
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            'internal_server_error',
+            'Internal server error',
         )
 
-    return CJSONResponse(content=response.model_dump())
+    return CJSONResponse(content=response)
@@ -0,0 +1,177 @@
+from bisect import bisect_left
+from typing import Any, Callable, Collection, Iterator, Sequence
+
+from core.constants import METRICS_LATENCY_BUCKETS
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ''
+
+    pairs = ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return f'{{{pairs}}}'
+
+
+class Histogram:
+    """
+    Cumulative histogram with labels, rendered in the Prometheus text format.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str],
+        buckets: Sequence[float] = METRICS_LATENCY_BUCKETS,
+    ) -> None:
+        """
+        Initializes a new instance of the Histogram class.
+
+        Args:
+            name (str): The metric name.
+            description (str): The metric help text.
+            label_names (Sequence[str]): The names of the labels of each observation.
+            buckets (Sequence[float]): The sorted upper bounds of the buckets.
+        """
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """
+        Records an observation.
+
+        Args:
+            value (float): The observed value.
+            *label_values (str): The label values, in the order of `label_names`.
+        """
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = ([0] * (len(self.buckets) + 1), [0.0])
+
+        counts, total = series
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def render(self) -> Iterator[str]:
+        """
+        Renders the histogram series.
+
+        Yields:
+            str: The lines of the metric.
+        """
+        yield f'# HELP {self.name} {self.description}'
+        yield f'# TYPE {self.name} histogram'
+
+        for label_values, (counts, total) in self._series.items():
+            labels = dict(zip(self.label_names, label_values))
+            cumulative = 0
+
+            for bound, count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += count
+                bucket_labels = _format_labels(labels | {'le': str(bound)})
+                yield f'{self.name}_bucket{bucket_labels} {cumulative}'
+
+            yield f'{self.name}_sum{_format_labels(labels)} {total[0]}'
+            yield f'{self.name}_count{_format_labels(labels)} {cumulative}'
+
+
+class MetricsRegistry:
+    """
+    Holds the histograms of the application and the collectors of live statistics,
+    and renders them all in the Prometheus text format.
+    """
+
+    def __init__(self) -> None:
+        self._histograms: list[Histogram] = []
+        self._collectors: list[tuple[str, Callable[[], dict[str, Any]], Collection[str]]] = []
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str],
+        buckets: Sequence[float] = METRICS_LATENCY_BUCKETS,
+    ) -> Histogram:
+        """
+        Creates and registers a histogram.
+
+        Args:
+            name (str): The metric name.
+            description (str): The metric help text.
+            label_names (Sequence[str]): The names of the labels of each observation.
+            buckets (Sequence[float]): The sorted upper bounds of the buckets.
+
+        Returns:
+            Histogram: The registered histogram.
+        """
+        histogram = Histogram(name, description, label_names, buckets)
+        self._histograms.append(histogram)
+
+        return histogram
+
+    def register_collector(
+        self,
+        prefix: str,
+        collect: Callable[[], dict[str, Any]],
+        counters: Collection[str] = (),
+    ) -> None:
+        """
+        Registers a function whose numeric statistics are exported on each scrape, e.g. the
+        `stats()` of a pool or a cache. Statistics are exported as gauges, except the
+        monotonic totals listed in `counters`, exported as counters with the `_total` suffix
+        so that `rate()` applies to them.
+
+        Args:
+            prefix (str): The prefix of the metric names.
+            collect (Callable[[], dict[str, Any]]): Returns the statistics by name.
+            counters (Collection[str]): The names of the statistics that only ever grow.
+        """
+        self._collectors.append((prefix, collect, frozenset(counters)))
+
+    def render(self) -> str:
+        """
+        Renders every metric.
+
+        Returns:
+            str: The metrics in the Prometheus text format.
+        """
+        lines: list[str] = []
+
+        for histogram in self._histograms:
+            lines.extend(histogram.render())
+
+        for prefix, collect, counters in self._collectors:
+            for name, value in collect().items():
+                if not isinstance(value, (int, float)) or isinstance(value, bool):
+                    continue
+
+                if name in counters:
+                    metric = f'{prefix}_{name}'.removesuffix('_total') + '_total'
+                    lines.append(f'# TYPE {metric} counter')
+                else:
+                    metric = f'{prefix}_{name}'
+                    lines.append(f'# TYPE {metric} gauge')
+                lines.append(f'{metric} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+
+metrics_registry = MetricsRegistry()
+
+request_duration = metrics_registry.histogram(
+    'http_request_duration_seconds',
+    'Duration of HTTP requests.',
+    ('method', 'route', 'status'),
+)
+request_phase_duration = metrics_registry.histogram(
+    'http_request_phase_duration_seconds',
+    'Duration of the phases of HTTP requests (jwt, db, encode, ...).',
+    ('route', 'phase'),
+)
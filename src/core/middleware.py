@@ -0,0 +1,39 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.metrics import request_duration, request_phase_duration
+from core.timing import start_request_timings
+
+
+class ServerTimingMiddleware:
+    """
+    Times every request: the phases recorded while handling it are sent back in the
+    `Server-Timing` header and aggregated, per route, into the request histograms.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        timings = start_request_timings()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                MutableHeaders(scope=message).append('server-timing', timings.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Unmatched paths share one label to keep the number of series bounded.
+            route = timings.route or 'unmatched'
+            request_duration.observe(timings.elapsed(), scope['method'], route, str(status_code))
+            for name, duration in timings.phases.items():
+                request_phase_duration.observe(duration, route, name)
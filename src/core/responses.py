@@ -1,6 +1,11 @@
 from typing import Any
 
 from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from core.schemas.responses import ResponseSchema
+from core.timing import phase
 
 
 class CJSONResponse(JSONResponse):
@@ -8,15 +13,37 @@ class CJSONResponse(JSONResponse):
     This is a custom JSON response class for all API endpoints.
     """
 
-    def __init__(self, content: dict[Any, Any], status_code: int = 200, **kwargs: Any) -> None:
+    def __init__(
+        self, content: dict[Any, Any] | BaseModel, status_code: int = 200, **kwargs: Any
+    ) -> None:
         """
         This is a custom JSON response class for all API endpoints.
 
         Args:
-            content (dict, optional): Response content. Defaults to None.
+            content (dict | BaseModel, optional): Response content. Defaults to None.
             status_code (int, optional): HTTP status code. Defaults to 200.
         """
-        if isinstance(content, dict):
+        if isinstance(content, ResponseSchema):
+            status_code = content.status_code
+        elif isinstance(content, dict):
             status_code = content.pop('status_code', status_code)
 
         super().__init__(content=content, status_code=status_code, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        """
+        Renders pydantic models straight to JSON bytes with pydantic-core, in one pass.
+        `status_code` is only used as the HTTP status, so it is left out of the body.
+        The time spent is recorded as the `encode` phase of the request.
+
+        Args:
+            content (Any): Response content.
+
+        Returns:
+            bytes: The JSON encoded body.
+        """
+        with phase('encode'):
+            if isinstance(content, BaseModel):
+                return to_json(content, exclude={'status_code'})
+
+            return super().render(content)
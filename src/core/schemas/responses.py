@@ -1,4 +1,4 @@
-from typing import Any, Generic, TypeVar
+from typing import Any, Generic, Optional, TypeVar
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -34,6 +34,20 @@ class ResponseSchema(BaseModel, Generic[M]):
     model_config = ConfigDict(json_schema_extra=schema_extra)
 
 
+class PaginatedResponse(BaseModel, Generic[M]):
+    """
+    This is a generic keyset paginated list schema for list API endpoints.
+    `next_cursor` is opaque for clients, they send it back to get the next page.
+    """
+
+    items: list[M] = Field(description='Page items')
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description='Cursor of the next page, null when this is the last page',
+        examples=['eyJpZCI6NTB9'],
+    )
+
+
 class ErrorResponse(BaseModel):
     """
     This is a generic error response schema for all API endpoints.
@@ -55,3 +69,20 @@ class InformationalResponse(BaseModel):
     status: str = Field(description='Healthcheck status', examples=['success', 'fail'])
     environment: str = Field(description='Application environment', examples=['dev', 'prod'])
     version: str = Field(description='Application version', examples=['1.0.0'])
+
+
+class DatabasePoolResponse(BaseModel):
+    """
+    This is a database pool statistics response schema for informational API endpoint.
+    """
+
+    size: int = Field(description='Configured pool size', examples=[5])
+    checked_in: int = Field(description='Idle connections in the pool', examples=[3])
+    checked_out: int = Field(description='Connections currently in use', examples=[2])
+    overflow: int = Field(description='Connections opened above the pool size', examples=[0])
+    max_overflow: int = Field(description='Maximum allowed overflow connections', examples=[10])
+    checkouts: int = Field(description='Total connection checkouts', examples=[1500])
+    timeouts: int = Field(description='Checkouts that timed out waiting', examples=[0])
+    wait_time_total: float = Field(description='Total checkout wait time in seconds')
+    wait_time_max: float = Field(description='Longest checkout wait time in seconds')
+    wait_time_avg: float = Field(description='Average checkout wait time in seconds')
@@ -0,0 +1,78 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+_K = TypeVar('_K', bound=Hashable)
+_V = TypeVar('_V')
+
+
+class SingleFlight(Generic[_K, _V]):
+    """
+    Coalesces concurrent calls with the same key: the first caller runs the call and the
+    callers arriving while it is in flight wait for its result instead of running their own.
+    Nothing is cached, a call arriving after the result is ready runs again.
+    It is not thread safe, it is meant to be used from the event loop only.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[_K, asyncio.Future[_V]] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: _K, call: Callable[[], Awaitable[_V]]) -> tuple[_V, bool]:
+        """
+        Runs the call, or waits for the call with the same key already in flight.
+
+        Args:
+            key (_K): The identity of the call.
+            call (Callable[[], Awaitable[_V]]): Produces the result.
+
+        Returns:
+            tuple[_V, bool]: The result, and whether it was shared from another caller.
+        """
+        future = self._calls.get(key)
+
+        if future is not None:
+            self.coalesced += 1
+            try:
+                # Shielded, so a waiter being cancelled does not cancel the shared call.
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if not future.cancelled() or (task is not None and task.cancelling()):
+                    raise
+            # The caller running the call was cancelled, this one runs it on its own.
+            return await call(), False
+
+        future = asyncio.get_running_loop().create_future()
+        # Marks the outcome as retrieved when nobody else waited for it.
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._calls[key] = future
+        self.calls += 1
+
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            del self._calls[key]
+
+        future.set_result(result)
+
+        return result, False
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns the coalescing counters.
+
+        Returns:
+            dict[str, int]: Calls in flight, calls run and calls that shared a result.
+        """
+        return {
+            'in_flight': len(self._calls),
+            'calls': self.calls,
+            'coalesced': self.coalesced,
+        }
@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+from core.cache import TTLCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(time, 'monotonic', clock)
+    return clock
+
+
+def test_get_returns_the_value_until_it_expires(clock: _Clock) -> None:
+    entries: TTLCache[str, int] = TTLCache(max_size=10, ttl=5)
+    entries.set('a', 1)
+
+    clock.now += 5
+    assert entries.get('a') == 1
+
+    clock.now += 0.1
+    assert entries.get('a') is None
+    assert len(entries) == 0
+    assert entries.stats() == {'size': 0, 'hits': 1, 'misses': 1}
+
+
+def test_set_overrides_the_ttl_per_entry(clock: _Clock) -> None:
+    entries: TTLCache[str, int] = TTLCache(max_size=10, ttl=5)
+    entries.set('short', 1, ttl=1)
+    entries.set('long', 2)
+
+    clock.now += 2
+
+    assert entries.get('short') is None
+    assert entries.get('long') == 2
+
+
+def test_set_evicts_the_least_recently_used_entry(clock: _Clock) -> None:
+    entries: TTLCache[str, int] = TTLCache(max_size=2, ttl=5)
+    entries.set('a', 1)
+    entries.set('b', 2)
+    entries.get('a')
+
+    entries.set('c', 3)
+
+    assert entries.get('b') is None
+    assert entries.get('a') == 1
+    assert entries.get('c') == 3
+
+
+def test_delete_where_removes_the_matching_entries(clock: _Clock) -> None:
+    entries: TTLCache[tuple[int, str], int] = TTLCache(max_size=10, ttl=5)
+    entries.set((1, 'a'), 1)
+    entries.set((1, 'b'), 2)
+    entries.set((2, 'a'), 3)
+
+    entries.delete_where(lambda key, _: key[0] == 1)
+
+    assert len(entries) == 1
+    assert entries.get((2, 'a')) == 3
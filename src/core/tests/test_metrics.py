@@ -0,0 +1,35 @@
+from core.metrics import MetricsRegistry
+
+
+def test_render_exports_the_listed_totals_as_counters() -> None:
+    registry = MetricsRegistry()
+    registry.register_collector(
+        'pool',
+        lambda: {'size': 5, 'checkouts': 12, 'wait_time_total': 0.5, 'enabled': True},
+        counters=('checkouts', 'wait_time_total'),
+    )
+
+    lines = registry.render().splitlines()
+
+    assert lines == [
+        '# TYPE pool_size gauge',
+        'pool_size 5',
+        '# TYPE pool_checkouts_total counter',
+        'pool_checkouts_total 12',
+        '# TYPE pool_wait_time_total counter',
+        'pool_wait_time_total 0.5',
+    ]
+
+
+def test_render_exports_the_histogram_buckets_cumulatively() -> None:
+    registry = MetricsRegistry()
+    histogram = registry.histogram('latency_seconds', 'Latency.', ('route',), buckets=(0.1, 1))
+    histogram.observe(0.05, '/a')
+    histogram.observe(0.5, '/a')
+
+    lines = registry.render().splitlines()
+
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 2' in lines
+    assert 'latency_seconds_count{route="/a"} 2' in lines
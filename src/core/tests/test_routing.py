@@ -0,0 +1,62 @@
+from datetime import datetime
+from typing import Any, AsyncIterator, cast
+
+import httpx
+import pytest
+from fastapi import APIRouter, FastAPI
+
+from core.routing import CAPIRoute
+from core.schemas.responses import ResponseSchema
+from user.models.general import User
+from user.schemas.general import UserSchema
+
+pytestmark = pytest.mark.anyio
+
+
+def _user() -> Any:
+    # A table model where the response model expects a schema, as a careless endpoint would.
+    now = datetime(2024, 1, 1)
+    return User(
+        id=1,
+        username='john_doe',
+        first_name='John',
+        last_name='Doe',
+        email='john@example.com',
+        hashed_password='$2b$12$secret',
+        token_version=3,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+@pytest.fixture
+async def client() -> AsyncIterator[httpx.AsyncClient]:
+    router = APIRouter(route_class=CAPIRoute)
+
+    @router.get('/annotated')
+    async def annotated() -> ResponseSchema[UserSchema]:
+        return ResponseSchema(code=0, data=_user(), status_code=200)
+
+    @router.get('/declared', response_model=ResponseSchema[UserSchema])
+    async def declared() -> Any:
+        return ResponseSchema(code=0, data=_user(), status_code=201)
+
+    app = FastAPI()
+    app.include_router(router)
+
+    transport = httpx.ASGITransport(app=cast(Any, app))
+    async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+        yield client
+
+
+@pytest.mark.parametrize(('path', 'status_code'), [('/annotated', 200), ('/declared', 201)])
+async def test_fields_outside_the_response_model_are_left_out(
+    client: httpx.AsyncClient, path: str, status_code: int
+) -> None:
+    response = await client.get(path)
+
+    assert response.status_code == status_code
+    data = response.json()['data']
+    assert data['username'] == 'john_doe'
+    assert set(data) == set(UserSchema.model_fields)
+    assert 'status_code' not in response.json()
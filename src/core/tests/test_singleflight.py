@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from core.singleflight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+
+class _Call:
+    def __init__(self, result: str = 'result') -> None:
+        self.result = result
+        self.runs = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self) -> str:
+        self.runs += 1
+        await self.release.wait()
+        return self.result
+
+
+async def _started(
+    flight: SingleFlight[str, str], key: str, call: _Call
+) -> asyncio.Task[tuple[str, bool]]:
+    task = asyncio.ensure_future(flight.do(key, call))
+    await asyncio.sleep(0)
+    return task
+
+
+async def test_do_shares_the_call_in_flight() -> None:
+    flight: SingleFlight[str, str] = SingleFlight()
+    call = _Call()
+
+    leader = await _started(flight, 'key', call)
+    waiter = await _started(flight, 'key', call)
+    assert flight.stats() == {'in_flight': 1, 'calls': 1, 'coalesced': 1}
+
+    call.release.set()
+
+    assert await leader == ('result', False)
+    assert await waiter == ('result', True)
+    assert call.runs == 1
+    assert flight.stats()['in_flight'] == 0
+
+
+async def test_do_runs_different_keys_and_later_calls_separately() -> None:
+    flight: SingleFlight[str, str] = SingleFlight()
+    call = _Call()
+    call.release.set()
+
+    await asyncio.gather(flight.do('a', call), flight.do('b', call))
+    await flight.do('a', call)
+
+    assert call.runs == 3
+    assert flight.stats() == {'in_flight': 0, 'calls': 3, 'coalesced': 0}
+
+
+async def test_do_raises_the_exception_of_the_call_to_every_caller() -> None:
+    flight: SingleFlight[str, str] = SingleFlight()
+    release = asyncio.Event()
+
+    async def fail() -> str:
+        await release.wait()
+        raise ValueError('failed')
+
+    leader = asyncio.ensure_future(flight.do('key', fail))
+    await asyncio.sleep(0)
+    waiter = asyncio.ensure_future(flight.do('key', fail))
+    await asyncio.sleep(0)
+    release.set()
+
+    for task in (leader, waiter):
+        with pytest.raises(ValueError, match='failed'):
+            await task
+    assert flight.stats()['in_flight'] == 0
+
+
+async def test_cancelling_a_waiter_does_not_cancel_the_call() -> None:
+    flight: SingleFlight[str, str] = SingleFlight()
+    call = _Call()
+
+    leader = await _started(flight, 'key', call)
+    waiter = await _started(flight, 'key', call)
+    waiter.cancel()
+    await asyncio.sleep(0)
+    call.release.set()
+
+    assert await leader == ('result', False)
+    assert waiter.cancelled()
+    assert call.runs == 1
+
+
+async def test_waiters_run_the_call_when_the_leader_is_cancelled() -> None:
+    flight: SingleFlight[str, str] = SingleFlight()
+    call = _Call()
+
+    leader = await _started(flight, 'key', call)
+    waiter = await _started(flight, 'key', call)
+    leader.cancel()
+    await asyncio.sleep(0)
+    call.release.set()
+
+    assert await waiter == ('result', False)
+    assert leader.cancelled()
+    assert call.runs == 2
+    assert flight.stats()['in_flight'] == 0
@@ -0,0 +1,94 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+
+class RequestTimings:
+    """
+    Durations of the phases of a request, in seconds. A phase entered several times
+    (e.g. one `db` per query) accumulates its durations.
+    """
+
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        self.route: str | None = None
+        self.phases: dict[str, float] = {}
+
+    def add(self, name: str, duration: float) -> None:
+        """
+        Adds a duration to a phase.
+
+        Args:
+            name (str): The phase name.
+            duration (float): The duration in seconds.
+        """
+        self.phases[name] = self.phases.get(name, 0.0) + duration
+
+    def elapsed(self) -> float:
+        """
+        Returns the time since the request started, in seconds.
+
+        Returns:
+            float: The elapsed time.
+        """
+        return time.perf_counter() - self.started_at
+
+    def server_timing(self) -> str:
+        """
+        Formats the phases and the total as a `Server-Timing` header value, in milliseconds.
+
+        Returns:
+            str: The header value.
+        """
+        metrics = [f'{name};dur={duration * 1000:.3f}' for name, duration in self.phases.items()]
+        metrics.append(f'total;dur={self.elapsed() * 1000:.3f}')
+
+        return ', '.join(metrics)
+
+
+_request_timings: ContextVar[RequestTimings | None] = ContextVar('request_timings', default=None)
+
+
+def start_request_timings() -> RequestTimings:
+    """
+    Starts the timings of the request running in the current context.
+
+    Returns:
+        RequestTimings: The timings of the request.
+    """
+    timings = RequestTimings()
+    _request_timings.set(timings)
+
+    return timings
+
+
+def current_timings() -> RequestTimings | None:
+    """
+    Returns the timings of the current request.
+
+    Returns:
+        RequestTimings | None: The timings, or None outside of a request.
+    """
+    return _request_timings.get()
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Times the enclosed block as a phase of the current request. Outside of a request
+    it does nothing.
+
+    Args:
+        name (str): The phase name, e.g. `jwt`, `db` or `encode`.
+    """
+    timings = _request_timings.get()
+    if timings is None:
+        yield
+        return
+
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started_at)
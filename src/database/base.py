@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import ClassVar, Optional
 
 from sqlmodel import Field, SQLModel
 
@@ -8,6 +8,10 @@ class BaseSQLModel(SQLModel):
     Base SQLModel class with an optional id field.
     We can use this class as a base class for all our models.
     if we need to add new id field, we can override the id field in the subclass.
+    `__cache_exclude__` lists the columns the repository cache must not store, e.g.
+    secrets or columns written too often to cache.
     """
 
+    __cache_exclude__: ClassVar[frozenset[str]] = frozenset()
+
     id: Optional[int] = Field(default=None, primary_key=True)
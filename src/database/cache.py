@@ -0,0 +1,232 @@
+import pickle
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Type
+
+from config.settings import get_settings
+from core.cache import TTLCache
+from database.base import BaseSQLModel
+
+# Stored for ids that do not exist, so repeated lookups of a missing id skip the database.
+_MISSING = b''
+
+
+class CacheBackend(ABC):
+    """
+    Shared storage of the repository cache, e.g. Redis, holding serialized rows.
+    Every worker reads through its own local tier first.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """
+        Gets a value.
+
+        Args:
+            key (str): The key to look up.
+
+        Returns:
+            bytes | None: The value, or None if it is missing or expired.
+        """
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """
+        Sets a value.
+
+        Args:
+            key (str): The key to store the value under.
+            value (bytes): The value to store.
+            ttl (float): Seconds the value stays valid.
+        """
+        pass
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """
+        Removes values if they are present.
+
+        Args:
+            *keys (str): The keys to remove.
+        """
+        pass
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Backend kept in the process, for tests and single worker deployments.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """
+        Initializes a new instance of the InMemoryCacheBackend class.
+
+        Args:
+            max_size (int): Maximum number of values kept before evicting the least recently used.
+        """
+        self._cache: TTLCache[str, bytes] = TTLCache(max_size=max_size, ttl=0)
+
+    async def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._cache.set(key, value, ttl=ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._cache.delete(key)
+
+
+class RepositoryCache:
+    """
+    Two-tier read-through cache of rows by primary key: an in-process LRU in front of a
+    shared backend. Rows are cached with the TTL of their table, missing ids with the
+    negative TTL. Invalidations reach the shared backend and the local tier of the current
+    worker only, so the local TTL bounds how stale the other workers can be.
+    The columns in the `__cache_exclude__` of a model are not stored, and are missing from
+    the cached instances, see `SQLModelRepository.get` which reloads them.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl: float,
+        model_ttls: dict[str, float],
+        negative_ttl: float,
+        local_max_size: int,
+        local_ttl: float,
+    ) -> None:
+        """
+        Initializes a new instance of the RepositoryCache class.
+
+        Args:
+            backend (CacheBackend): The shared tier.
+            ttl (float): Seconds a row stays cached, unless its table has its own TTL.
+            model_ttls (dict[str, float]): Seconds a row stays cached, by table name.
+            negative_ttl (float): Seconds a missing id stays cached.
+            local_max_size (int): Maximum number of entries of the local tier.
+            local_ttl (float): Maximum seconds an entry stays in the local tier.
+        """
+        self._backend = backend
+        self._ttl = ttl
+        self._model_ttls = model_ttls
+        self._negative_ttl = negative_ttl
+        self._local: TTLCache[str, bytes] = TTLCache(max_size=local_max_size, ttl=local_ttl)
+        self._local_ttl = local_ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(model: Type[BaseSQLModel], id: Any) -> str:
+        return f'{model.__tablename__}:{id}'
+
+    async def get(self, model: Type[BaseSQLModel], id: Any) -> tuple[bool, Any]:
+        """
+        Gets a cached row.
+
+        Args:
+            model (Type[BaseSQLModel]): The model of the row.
+            id (Any): The primary key of the row.
+
+        Returns:
+            tuple[bool, Any]: Whether it was cached, and a new transient instance of the row,
+            without its excluded columns, or None if the id is cached as missing.
+        """
+        key = self._key(model, id)
+
+        value = self._local.get(key)
+        if value is None:
+            value = await self._backend.get(key)
+            if value is None:
+                self.misses += 1
+                return False, None
+
+            ttl = self._negative_ttl if value == _MISSING else self._local_ttl
+            self._local.set(key, value, ttl=min(ttl, self._local_ttl))
+
+        self.hits += 1
+
+        if value == _MISSING:
+            return True, None
+
+        obj = model.model_validate(pickle.loads(value))
+        for name in model.__cache_exclude__:
+            # Absent from the instance state rather than set to their defaults.
+            obj.__dict__.pop(name, None)
+
+        return True, obj
+
+    async def set(self, model: Type[BaseSQLModel], id: Any, obj: BaseSQLModel | None) -> None:
+        """
+        Caches a row, or that the id does not exist.
+
+        Args:
+            model (Type[BaseSQLModel]): The model of the row.
+            id (Any): The primary key of the row.
+            obj (BaseSQLModel | None): The row, None if it does not exist.
+        """
+        key = self._key(model, id)
+
+        if obj is None:
+            value, ttl = _MISSING, self._negative_ttl
+        else:
+            row = obj.model_dump(exclude=set(model.__cache_exclude__))
+            value = pickle.dumps(row, protocol=pickle.HIGHEST_PROTOCOL)
+            ttl = self._model_ttls.get(model.__tablename__, self._ttl)  # type: ignore [arg-type]
+
+        self._local.set(key, value, ttl=min(ttl, self._local_ttl))
+        await self._backend.set(key, value, ttl)
+
+    async def invalidate(self, model: Type[BaseSQLModel], *ids: Any) -> None:
+        """
+        Removes rows from both tiers, after they were written.
+
+        Args:
+            model (Type[BaseSQLModel]): The model of the rows.
+            *ids (Any): The primary keys of the rows.
+        """
+        keys = [self._key(model, id) for id in ids]
+
+        for key in keys:
+            self._local.delete(key)
+        await self._backend.delete(*keys)
+
+        self.invalidations += len(keys)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict[str, int]: Local tier size, hits, misses and invalidated rows.
+        """
+        return {
+            'local_size': len(self._local),
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+        }
+
+
+@lru_cache
+def get_repository_cache() -> RepositoryCache | None:
+    """
+    Returns the repository cache, built on first use from the database settings.
+
+    Returns:
+        RepositoryCache | None: The cache, or None if it is disabled.
+    """
+    database_config = get_settings().database_config
+    if not database_config.cache_enabled:
+        return None
+
+    return RepositoryCache(
+        backend=InMemoryCacheBackend(max_size=database_config.cache_local_max_size),
+        ttl=database_config.cache_ttl_seconds,
+        model_ttls=database_config.cache_model_ttl_seconds,
+        negative_ttl=database_config.cache_negative_ttl_seconds,
+        local_max_size=database_config.cache_local_max_size,
+        local_ttl=database_config.cache_local_ttl_seconds,
+    )
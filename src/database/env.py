@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from sqlmodel import SQLModel  # noqa F401
 
 from config.settings import get_settings
+from database.migrations import set_timeouts
 from database.models import *  # noqa F403
 
 settings_app = get_settings()
@@ -60,6 +61,11 @@ def do_run_migrations(connection: Connection) -> None:
     context.configure(connection=connection, target_metadata=target_metadata)
 
     with context.begin_transaction():
+        set_timeouts(
+            connection,
+            lock_timeout_ms=settings_app.database_config.migration_lock_timeout_ms,
+            statement_timeout_ms=settings_app.database_config.migration_statement_timeout_ms,
+        )
         context.run_migrations()
 
 
@@ -0,0 +1,149 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Callable, TypeVar
+
+from sqlalchemy import Connection, event
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+_F = TypeVar('_F', bound=Callable[..., Any])
+
+
+class QueryStats:
+    """
+    SQL statements executed while handling a request, with their total database time.
+    Statements are grouped by their SQL text, which holds placeholders instead of values,
+    so the same query run for several rows shares one shape.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        """
+        Records an executed statement.
+
+        Args:
+            statement (str): The SQL text of the statement.
+            duration (float): The execution time in seconds.
+        """
+        self.count += 1
+        self.duration += duration
+        self.shapes[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """
+        Returns the statement shapes executed at least `threshold` times, the usual
+        signature of an N+1 query.
+
+        Args:
+            threshold (int): The minimum number of executions.
+
+        Returns:
+            list[tuple[str, int]]: The repeated statements and their counts.
+        """
+        return [(shape, count) for shape, count in self.shapes.items() if count >= threshold]
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar('query_stats', default=None)
+
+
+def start_query_stats() -> QueryStats:
+    """
+    Starts counting the statements of the request running in the current context.
+
+    Returns:
+        QueryStats: The statistics of the request.
+    """
+    stats = QueryStats()
+    _query_stats.set(stats)
+
+    return stats
+
+
+def current_query_stats() -> QueryStats | None:
+    """
+    Returns the statement statistics of the current request.
+
+    Returns:
+        QueryStats | None: The statistics, or None outside of a request.
+    """
+    return _query_stats.get()
+
+
+def _before_cursor_execute(
+    conn: Connection, cursor: Any, statement: str, parameters: Any, context: Any, *args: Any
+) -> None:
+    conn.info.setdefault('query_started_at', []).append((context, time.perf_counter()))
+
+
+def _after_cursor_execute(conn: Connection, cursor: Any, statement: str, *args: Any) -> None:
+    _, started_at = conn.info['query_started_at'].pop()
+
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - started_at)
+
+
+def _handle_error(context: ExceptionContext) -> None:
+    # A failed statement never reaches `after_cursor_execute`, its start time is dropped here.
+    if context.connection is None or context.execution_context is None:
+        return
+
+    started = context.connection.info.get('query_started_at')
+    while started and started[-1][0] is context.execution_context:
+        started.pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Hooks the cursor execution events of the engine to count the statements and the
+    database time of the current request.
+
+    Args:
+        engine (AsyncEngine): The engine to instrument.
+    """
+    event.listen(engine.sync_engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine.sync_engine, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(engine.sync_engine, 'handle_error', _handle_error)
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    Error response of a route running more statements than its query budget, in strict mode.
+    """
+
+
+def query_budget(max_queries: int) -> Callable[[_F], _F]:
+    """
+    Declares the maximum number of SQL statements a route may run before its response starts,
+    dependencies included. Place it below the router decorator.
+
+    Args:
+        max_queries (int): The number of statements allowed.
+
+    Returns:
+        Callable[[_F], _F]: The decorator setting the budget on the endpoint.
+    """
+
+    def decorator(endpoint: _F) -> _F:
+        endpoint.__query_budget__ = max_queries  # type: ignore [attr-defined]
+        return endpoint
+
+    return decorator
+
+
+def get_query_budget(endpoint: Any) -> int | None:
+    """
+    Returns the query budget declared on an endpoint.
+
+    Args:
+        endpoint (Any): The endpoint of the matched route.
+
+    Returns:
+        int | None: The budget, or None if the route has none.
+    """
+    return getattr(endpoint, '__query_budget__', None)
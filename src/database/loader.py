@@ -0,0 +1,99 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Generic, Hashable, Sequence, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+_K = TypeVar('_K', bound=Hashable)
+_V = TypeVar('_V')
+
+BatchLoadFn = Callable[[Sequence[_K]], Awaitable[Sequence[_V | None]]]
+
+
+class ModelLoader(Generic[_K, _V]):
+    """
+    Coalesces the keys requested in the same event loop tick into a single batch load.
+    Repeated keys within a batch share one result. Batches run one at a time, since they
+    share the session of the request. A caller being cancelled does not affect the other
+    callers of the batch.
+    """
+
+    def __init__(self, batch_load: BatchLoadFn[_K, _V]) -> None:
+        """
+        Initializes a new instance of the ModelLoader class.
+
+        Args:
+            batch_load (BatchLoadFn): Loads the values of distinct keys, in the order given,
+                with None for the missing ones.
+        """
+        self._batch_load = batch_load
+        self._pending: dict[_K, asyncio.Future[_V | None]] = {}
+        self._lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def load(self, key: _K) -> Awaitable[_V | None]:
+        """
+        Schedules the key for the next batch.
+
+        Args:
+            key (_K): The key to load.
+
+        Returns:
+            Awaitable[_V | None]: Resolves to the value, or None if it does not exist.
+        """
+        future = self._pending.get(key)
+
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            future = self._pending[key] = loop.create_future()
+
+        # Shielded, so a caller being cancelled does not cancel the future shared by the key.
+        return asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        batch, self._pending = self._pending, {}
+
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[_K, asyncio.Future[_V | None]]) -> None:
+        try:
+            async with self._lock:
+                values = await self._batch_load(list(batch))
+        except BaseException as exc:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+            return
+
+        for future, value in zip(batch.values(), values):
+            if not future.done():
+                future.set_result(value)
+
+
+def get_loader(
+    async_session: AsyncSession, key: Hashable, batch_load: BatchLoadFn[Any, Any]
+) -> ModelLoader[Any, Any]:
+    """
+    Returns the loader registered under the key on the session, creating it on first use.
+    Loaders live in `session.info`, so they are scoped to the session of the request.
+
+    Args:
+        async_session (AsyncSession): The session the loader batches its queries on.
+        key (Hashable): The loader identity, usually the model type.
+        batch_load (BatchLoadFn): The batch function used when the loader is created.
+
+    Returns:
+        ModelLoader[Any, Any]: The loader of the session.
+    """
+    loaders: dict[Hashable, ModelLoader[Any, Any]] = async_session.info.setdefault('loaders', {})
+
+    loader = loaders.get(key)
+    if loader is None:
+        loader = loaders[key] = ModelLoader(batch_load)
+
+    return loader
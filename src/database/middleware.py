@@ -0,0 +1,136 @@
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config.settings import get_settings
+from core.exceptions.handler import http_exception_handler
+from core.metrics import metrics_registry
+from core.timing import current_timings
+from database.instrumentation import (
+    QueryBudgetExceeded,
+    QueryStats,
+    get_query_budget,
+    start_query_stats,
+)
+from database.session import READ_YOUR_WRITES_COOKIE
+
+logger = logging.getLogger(__name__)
+
+_settings_app = get_settings()
+
+statements_per_request = metrics_registry.histogram(
+    'db_statements_per_request',
+    'Number of SQL statements run by HTTP requests.',
+    ('route',),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Sets the read-your-writes cookie on responses of requests that committed on the primary,
+    so `get_read_session` keeps that client on the primary while replicas catch up.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.cookie = (
+            f'{READ_YOUR_WRITES_COOKIE}=1; '
+            f'Max-Age={_settings_app.database_config.replica_stickiness_seconds}; '
+            'Path=/; HttpOnly; SameSite=Lax'
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message['type'] == 'http.response.start' and scope.get('state', {}).get('db_wrote'):
+                MutableHeaders(scope=message).append('set-cookie', self.cookie)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class QueryStatsMiddleware:
+    """
+    Counts the SQL statements of every request. Statements repeated `n_plus_one_threshold`
+    times are logged as a possible N+1, and routes running more statements than their
+    `query_budget` before responding are logged. In `query_budget_strict` mode their response
+    is replaced by the error response of `QueryBudgetExceeded` before it starts.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.n_plus_one_threshold = _settings_app.database_config.n_plus_one_threshold
+        self.strict = _settings_app.database_config.query_budget_strict
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        stats = start_query_stats()
+        replaced = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal replaced
+            if replaced:
+                # The body of the response replaced by the error is dropped.
+                return
+
+            if message['type'] == 'http.response.start':
+                exceeded = self._check_budget(scope, stats)
+                if exceeded is not None:
+                    replaced = True
+                    response = http_exception_handler(Request(scope, receive), exceeded)
+                    await response(scope, receive, send)
+                    return
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self._report(scope, stats)
+
+    def _check_budget(self, scope: Scope, stats: QueryStats) -> QueryBudgetExceeded | None:
+        budget = get_query_budget(scope.get('endpoint'))
+        if budget is None or stats.count <= budget:
+            return None
+
+        message = (
+            f'{scope["method"]} {scope["path"]} ran {stats.count} SQL statements, '
+            f'its query budget is {budget}'
+        )
+        if self.strict:
+            logger.error(message)
+            return QueryBudgetExceeded(message)
+
+        logger.warning(message)
+        return None
+
+    def _report(self, scope: Scope, stats: QueryStats) -> None:
+        timings = current_timings()
+        route = timings.route if timings is not None and timings.route else 'unmatched'
+        statements_per_request.observe(stats.count, route)
+
+        for statement, count in stats.repeated(self.n_plus_one_threshold):
+            logger.warning(
+                'Possible N+1 in %s %s, statement ran %d times: %s',
+                scope['method'],
+                scope['path'],
+                count,
+                ' '.join(statement.split()),
+            )
+
+        logger.debug(
+            '%s %s ran %d SQL statements in %.3f ms',
+            scope['method'],
+            scope['path'],
+            stats.count,
+            stats.duration * 1000,
+        )
@@ -0,0 +1,187 @@
+"""
+Helpers for migrations that must not lock large tables, to use from `database/versions/*`.
+
+PostgreSQL only builds indexes without blocking writes outside of a transaction, and a
+backfill in a single UPDATE holds its row locks until the migration commits. These helpers
+step out of the migration transaction for that, so keep each such operation in its own
+revision: the statements before it are committed when it starts.
+"""
+
+import logging
+import time
+from typing import Any, Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+
+def _is_postgresql(connection: Connection) -> bool:
+    return connection.dialect.name == 'postgresql'
+
+
+def set_timeouts(
+    connection: Connection, lock_timeout_ms: int, statement_timeout_ms: int = 0
+) -> None:
+    """
+    Sets the lock and statement timeouts of the migration connection on PostgreSQL, so
+    a migration waiting behind a long transaction fails fast instead of queueing every
+    query on the table behind it. They are session settings, so they also apply in
+    autocommit blocks. Does nothing on other databases.
+
+    Args:
+        connection (Connection): The migration connection.
+        lock_timeout_ms (int): Milliseconds to wait for a lock, 0 to wait forever.
+        statement_timeout_ms (int): Milliseconds a statement may run, 0 for no limit.
+    """
+    if not _is_postgresql(connection):
+        return
+
+    connection.execute(sa.text(f'SET lock_timeout = {int(lock_timeout_ms)}'))
+    connection.execute(sa.text(f'SET statement_timeout = {int(statement_timeout_ms)}'))
+
+
+def create_index_concurrently(
+    index_name: str, table_name: str, columns: Sequence[str], unique: bool = False, **kw: Any
+) -> None:
+    """
+    Creates an index without blocking writes to the table, with `CREATE INDEX CONCURRENTLY`
+    outside of the migration transaction. An invalid index left by a failed concurrent build
+    is dropped first, so the migration can be retried. Other databases get a plain index.
+
+    Args:
+        index_name (str): The index name.
+        table_name (str): The table name.
+        columns (Sequence[str]): The indexed columns.
+        unique (bool): Whether the index is unique.
+        **kw (Any): Extra options of `op.create_index`, e.g. `postgresql_where`.
+    """
+    connection = op.get_bind()
+
+    if not _is_postgresql(connection):
+        op.create_index(index_name, table_name, list(columns), unique=unique, **kw)
+        return
+
+    with op.get_context().autocommit_block():
+        valid = connection.execute(
+            sa.text(
+                'SELECT i.indisvalid FROM pg_index i '
+                'JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name'
+            ),
+            {'name': index_name},
+        ).scalar_one_or_none()
+
+        if valid is True:
+            return
+        if valid is False:
+            logger.warning('Dropping the invalid index %s left by a failed build', index_name)
+            op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True)
+
+        op.create_index(
+            index_name,
+            table_name,
+            list(columns),
+            unique=unique,
+            postgresql_concurrently=True,
+            **kw,
+        )
+
+
+def drop_index_concurrently(index_name: str, table_name: str) -> None:
+    """
+    Drops an index without blocking the table, with `DROP INDEX CONCURRENTLY` outside of
+    the migration transaction. Other databases get a plain drop.
+
+    Args:
+        index_name (str): The index name.
+        table_name (str): The table name.
+    """
+    if not _is_postgresql(op.get_bind()):
+        op.drop_index(index_name, table_name=table_name)
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True
+        )
+
+
+def backfill(
+    table_name: str,
+    values: dict[str, Any],
+    where: str | None = None,
+    key: str = 'id',
+    batch_size: int = 1000,
+    pause_seconds: float = 0.1,
+) -> int:
+    """
+    Updates the rows of a large table in batches walked by primary key, each committed on
+    its own, so locks are held for one batch only and replicas can keep up. The pause
+    between batches throttles the load, and the progress is logged after every batch.
+    The backfill is resumable: rerunning it with the same `where` skips the rows done.
+
+    Args:
+        table_name (str): The table name.
+        values (dict[str, Any]): The new values by column, literals or SQL expressions
+            such as `sa.text('created_at')`.
+        where (str | None): SQL condition of the rows still to update, e.g.
+            `'last_seen_at IS NULL'`.
+        key (str): The integer primary key the batches are walked by.
+        batch_size (int): Rows per batch.
+        pause_seconds (float): Seconds to sleep between batches.
+
+    Returns:
+        int: The number of rows updated.
+    """
+    connection = op.get_bind()
+    table = sa.table(table_name, sa.column(key), *(sa.column(name) for name in values))
+    pk = table.c[key]
+    # Parenthesized, so a condition with OR keeps its meaning next to the batch range.
+    condition: sa.ColumnElement[bool] = (
+        sa.literal_column(f'({where})', sa.Boolean()) if where is not None else sa.true()
+    )
+
+    with op.get_context().autocommit_block():
+        last_key = connection.execute(sa.select(sa.func.max(pk))).scalar()
+        if last_key is None:
+            return 0
+
+        updated = 0
+        after: Any = None
+        started_at = time.perf_counter()
+
+        while True:
+            statement = sa.select(pk).where(condition).order_by(pk).limit(batch_size)
+            if after is not None:
+                statement = statement.where(pk > after)
+
+            keys = connection.execute(statement).scalars().all()
+            if not keys:
+                break
+
+            result = connection.execute(
+                sa.update(table).where(pk.between(keys[0], keys[-1]), condition).values(values)
+            )
+            updated += result.rowcount
+            after = keys[-1]
+
+            elapsed = time.perf_counter() - started_at
+            logger.info(
+                'Backfill of %s: %d rows, %s up to %s of %s (%.1f%%), %.0f rows/s',
+                table_name,
+                updated,
+                key,
+                after,
+                last_key,
+                min(after / last_key * 100, 100) if last_key else 100,
+                updated / elapsed if elapsed else 0,
+            )
+
+            if len(keys) < batch_size:
+                break
+
+            time.sleep(pause_seconds)
+
+    return updated
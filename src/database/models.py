@@ -12,3 +12,6 @@ Steps to create a migration:
 """
 ## User module
 from user.models import User  # noqa F403
+
+## Auth module
+from auth.models import RefreshToken  # noqa F403
@@ -0,0 +1,46 @@
+import base64
+import binascii
+import json
+
+from core.exceptions.exceptions import InvalidCursorException
+
+
+def encode_cursor(id: int) -> str:
+    """
+    Encodes the keyset position of the last returned row into an opaque cursor.
+
+    Args:
+        id (int): The ID of the last row of the page.
+
+    Returns:
+        str: The URL safe cursor.
+    """
+    payload = json.dumps({'id': id}, separators=(',', ':')).encode()
+
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decodes an opaque cursor back into the keyset position.
+
+    Args:
+        cursor (str): The cursor returned with the previous page.
+
+    Returns:
+        int: The ID of the last row of the previous page.
+
+    Raises:
+        InvalidCursorException: If the cursor was not produced by `encode_cursor`.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        id = json.loads(payload)['id']
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise InvalidCursorException
+
+    # Anything other than an integer would only fail later, in the keyset comparison.
+    if not isinstance(id, int) or isinstance(id, bool):
+        raise InvalidCursorException
+
+    return id
@@ -1,13 +1,36 @@
 from abc import ABC, abstractmethod
-from typing import Any, Generic, Sequence, Type, TypeVar
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Generic,
+    Hashable,
+    Sequence,
+    Type,
+    TypeVar,
+)
 
+from sqlalchemy import Executable, Result
+from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+from sqlmodel import col, delete, select, update
 
+from core.constants import PAGINATION_MAX_LIMIT
+from core.singleflight import SingleFlight
+from core.timing import phase
 from database.base import BaseSQLModel
+from database.cache import get_repository_cache
+from database.loader import get_loader
+from database.pagination import decode_cursor, encode_cursor
 
 _M = TypeVar('_M', bound=BaseSQLModel)
 
+# Identical reads in flight in this worker, shared across sessions.
+repository_flights: SingleFlight[Hashable, Any] = SingleFlight()
+
 
 class BaseRepository(ABC, Generic[_M]):
     def __init__(self, async_session: AsyncSession):
@@ -17,10 +40,20 @@ class BaseRepository(ABC, Generic[_M]):
     async def get(self, id: Any) -> _M | None:
         pass
 
+    @abstractmethod
+    async def get_many(self, ids: Sequence[Any]) -> list[_M | None]:
+        pass
+
     @abstractmethod
     async def get_all(self) -> Sequence[_M]:
         pass
 
+    @abstractmethod
+    async def get_page(
+        self, limit: int, cursor: str | None = None
+    ) -> tuple[Sequence[_M], str | None]:
+        pass
+
     @abstractmethod
     async def create(self, obj: _M) -> _M:
         pass
@@ -48,9 +81,138 @@ class SQLModelRepository(BaseRepository[_M]):
         self._model = model
         super().__init__(async_session)
 
+    async def _execute(self, statement: Executable, params: Any = None) -> Result[Any]:
+        """
+        Executes a statement, timed as the `db` phase of the request.
+
+        Args:
+            statement (Executable): The statement to execute.
+            params (Any): The bound parameters, a list of them for an executemany.
+
+        Returns:
+            Result[Any]: The result of the statement.
+        """
+        if statement.is_dml:
+            self.async_session.info['pending_writes'] = True
+
+        with phase('db'):
+            return await self.async_session.execute(statement, params)
+
+    async def _commit(self, *refresh: _M) -> None:
+        """
+        Commits the session and refreshes the given objects, timed as the `db` phase.
+
+        Args:
+            *refresh (_M): The objects to reload after the commit.
+        """
+        with phase('db'):
+            await self.async_session.commit()
+            self.async_session.info.pop('pending_writes', None)
+            for obj in refresh:
+                await self.async_session.refresh(obj)
+
+    async def _invalidate(self, *ids: Any) -> None:
+        """
+        Removes written objects from the repository cache, if it is enabled.
+
+        Args:
+            *ids (Any): The IDs of the objects that changed.
+        """
+        cache = get_repository_cache()
+        if cache is not None and ids:
+            await cache.invalidate(self._model, *ids)
+
+    def _has_pending_writes(self) -> bool:
+        """
+        Whether the session holds changes that are not committed, which other sessions
+        must not see.
+
+        Returns:
+            bool: True if the session has unflushed or uncommitted writes.
+        """
+        session = self.async_session
+        return bool(
+            session.new or session.dirty or session.deleted or session.info.get('pending_writes')
+        )
+
+    async def _attach(self, record: _M) -> _M:
+        """
+        Attaches a copy of an object loaded elsewhere to the session, without a query.
+
+        Args:
+            record (_M): A transient object with the state of a row.
+
+        Returns:
+            _M: The persistent object of the session.
+        """
+        make_transient_to_detached(record)
+        return await self.async_session.merge(record, load=False)
+
+    async def _attach_cached(self, record: _M) -> _M | None:
+        """
+        Attaches an object read from the repository cache to the session, and loads the
+        columns the cache does not store.
+
+        Args:
+            record (_M): A transient object read from the repository cache.
+
+        Returns:
+            _M | None: The persistent object of the session, or None if the row was deleted
+            since it was cached.
+        """
+        obj = await self._attach(record)
+
+        if not self._model.__cache_exclude__:
+            return obj
+
+        try:
+            with phase('db'):
+                await self.async_session.refresh(obj, list(self._model.__cache_exclude__))
+        except InvalidRequestError:
+            # Deleted by another worker, whose invalidation did not reach our local tier.
+            self.async_session.expunge(obj)
+            return None
+
+        return obj
+
+    async def _single_flight(
+        self, key: Hashable, load: Callable[[], Awaitable[_M | None]]
+    ) -> _M | None:
+        """
+        Runs a read once for all the identical reads in flight in this worker on the same
+        database, so a session on the primary never gets the result of a replica read.
+        Callers that share the result of another session get their own copy, attached to their
+        session. Sessions with pending writes always run their own read.
+
+        Args:
+            key (Hashable): The identity of the read, including the model.
+            load (Callable[[], Awaitable[_M | None]]): Runs the read on this session.
+
+        Returns:
+            _M | None: The object read, or None if it does not exist.
+        """
+        if self._has_pending_writes():
+            return await load()
+
+        # Read sessions pick their replica here if they did not run a query yet.
+        bind = self.async_session.sync_session.get_bind()
+
+        record: _M | None
+        record, shared = await repository_flights.do((bind, key), load)
+        if not shared or record is None or record in self.async_session:
+            return record
+
+        return await self._attach(self._model.model_validate(record.model_dump()))
+
     async def get(self, id: Any) -> _M | None:
         """
         Retrieves an object from the database based on its ID.
+        Concurrent calls on the same session are batched into a single `get_many` query,
+        and identical calls from concurrent sessions share a single read.
+        When the repository cache is enabled, it is read through first, and cached objects
+        are attached to the session without a query. The columns the cache does not store
+        are then reloaded with a query of their own, since an AsyncSession cannot load them
+        lazily when they are accessed.
 
         Args:
             id (Any): The ID of the object to retrieve.
@@ -58,9 +220,44 @@ class SQLModelRepository(BaseRepository[_M]):
         Returns:
             _M | None: The retrieved object, or None if the object does not exist.
         """
-        statement = select(self._model).where(self._model.id == id)
-        result = await self.async_session.execute(statement)
-        return result.scalar_one_or_none()
+        cache = get_repository_cache()
+
+        if cache is not None:
+            loaded = self.async_session.identity_map.get(identity_key(self._model, id))
+            if loaded is not None:
+                return loaded
+
+            cached, record = await cache.get(self._model, id)
+            if cached:
+                return await self._attach_cached(record) if record is not None else None
+
+        async def load() -> _M | None:
+            record = await get_loader(self.async_session, self._model, self.get_many).load(id)
+            if cache is not None:
+                await cache.set(self._model, id, record)
+            return record
+
+        return await self._single_flight((self._model, 'id', id), load)
+
+    async def get_many(self, ids: Sequence[Any]) -> list[_M | None]:
+        """
+        Retrieves several objects from the database with a single IN query.
+
+        Args:
+            ids (Sequence[Any]): The IDs of the objects to retrieve, duplicates are allowed.
+
+        Returns:
+            list[_M | None]: The objects in the order of `ids`, None for the missing ones.
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        if not unique_ids:
+            return []
+
+        statement = select(self._model).where(col(self._model.id).in_(unique_ids))
+        result = await self._execute(statement)
+        records = {record.id: record for record in result.scalars()}
+
+        return [records.get(id) for id in ids]
 
     async def get_all(self) -> Sequence[_M]:
         """
@@ -70,9 +267,59 @@ class SQLModelRepository(BaseRepository[_M]):
             Sequence[_M]: A sequence of all objects in the database.
         """
         statement = select(self._model)
-        result = await self.async_session.execute(statement)
+        result = await self._execute(statement)
         return result.scalars().all()
 
+    async def get_page(
+        self, limit: int, cursor: str | None = None
+    ) -> tuple[Sequence[_M], str | None]:
+        """
+        Retrieves a page of objects ordered by ID using keyset pagination.
+
+        Args:
+            limit (int): The maximum number of objects to return, capped at PAGINATION_MAX_LIMIT.
+            cursor (str | None): The cursor returned with the previous page, None for the first one.
+
+        Returns:
+            tuple[Sequence[_M], str | None]: The objects of the page and the cursor of the next
+            page, or None if this is the last page.
+        """
+        limit = min(limit, PAGINATION_MAX_LIMIT)
+        statement = select(self._model).order_by(self._model.id).limit(limit + 1)  # type: ignore
+
+        if cursor is not None:
+            statement = statement.where(col(self._model.id) > decode_cursor(cursor))
+
+        result = await self._execute(statement)
+        records = result.scalars().all()
+
+        if len(records) <= limit:
+            return records, None
+
+        return records[:limit], encode_cursor(records[limit - 1].id)
+
+    async def stream_batches(self, batch_size: int) -> AsyncIterator[Sequence[_M]]:
+        """
+        Streams every object ordered by ID through a server-side cursor.
+        Only one batch is held in memory at a time, whatever the size of the table.
+
+        Args:
+            batch_size (int): The number of objects fetched per batch.
+
+        Yields:
+            Sequence[_M]: The next batch of objects.
+        """
+        statement = (
+            select(self._model)
+            .order_by(self._model.id)  # type: ignore
+            .execution_options(yield_per=batch_size)
+        )
+        with phase('db'):
+            result = await self.async_session.stream(statement)
+
+        async for batch in result.scalars().partitions():
+            yield batch
+
     async def create(self, obj: _M) -> _M:
         """
         Creates a new object in the database.
@@ -84,13 +331,14 @@ class SQLModelRepository(BaseRepository[_M]):
             _M: The created object.
         """
         self.async_session.add(obj)
-        await self.async_session.commit()
-        await self.async_session.refresh(obj)
+        await self._commit(obj)
+        await self._invalidate(obj.id)
         return obj
 
     async def update(self, id: Any, obj: _M) -> _M | None:
         """
-        Updates an existing object in the database.
+        Updates an existing object in the database with a single UPDATE ... RETURNING.
+        Only the fields explicitly set on `obj` are written, never its defaults.
 
         Args:
             id (Any): The ID of the object to update.
@@ -99,21 +347,26 @@ class SQLModelRepository(BaseRepository[_M]):
         Returns:
             _M | None: The updated object, or None if the object does not exist.
         """
-        record = await self.get(id)
-        if record is None:
-            return None
+        values = obj.model_dump(exclude_unset=True, exclude_none=True, exclude={'id'})
+        if not values:
+            return await self.get(id)
 
-        for attr, value in obj.model_dump(exclude_none=True).items():
-            setattr(record, attr, value)
-
-        self.async_session.add(record)
-        await self.async_session.commit()
-        await self.async_session.refresh(record)
+        statement = (
+            update(self._model)
+            .where(col(self._model.id) == id)
+            .values(**values)
+            .returning(self._model)
+            .execution_options(populate_existing=True)
+        )
+        result = await self._execute(statement)
+        record = result.scalar_one_or_none()
+        await self._commit()
+        await self._invalidate(id)
         return record
 
     async def delete(self, id: Any) -> _M | None:
         """
-        Deletes an object from the database.
+        Deletes an object from the database with a single DELETE ... RETURNING.
 
         Args:
             id (Any): The ID of the object to delete.
@@ -121,9 +374,9 @@ class SQLModelRepository(BaseRepository[_M]):
         Returns:
             _M | None: The deleted object, or None if the object does not exist.
         """
-        record = await self.get(id)
-        if record is None:
-            return None
-        await self.async_session.delete(record)
-        await self.async_session.commit()
+        statement = delete(self._model).where(col(self._model.id) == id).returning(self._model)
+        result = await self._execute(statement)
+        record = result.scalar_one_or_none()
+        await self._commit()
+        await self._invalidate(id)
         return record
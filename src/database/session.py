@@ -1,27 +1,190 @@
-from sqlalchemy.ext.asyncio import create_async_engine
-from sqlalchemy.orm import sessionmaker
+import itertools
+import logging
+import time
+from typing import Any
+
+from fastapi import Request
+from sqlalchemy import Connection, Engine, event
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from config.settings import get_settings
+from database.instrumentation import instrument_engine
+from database.pool import InstrumentedAsyncAdaptedQueuePool
+
+logger = logging.getLogger(__name__)
 
 _settings_app = get_settings()
+_database_config = _settings_app.database_config
+
+READ_YOUR_WRITES_COOKIE = 'db_primary'
 
-async_engine = create_async_engine(_settings_app.database_url, echo=True, future=True)
 
+def _create_engine(url: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        echo=_database_config.echo,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=_database_config.pool_size,
+        max_overflow=_database_config.max_overflow,
+        pool_recycle=_database_config.pool_recycle,
+        pool_pre_ping=_database_config.pool_pre_ping,
+        pool_timeout=_database_config.pool_timeout,
+    )
+    instrument_engine(engine)
+
+    return engine
 
-async def get_session() -> AsyncSession:  # type: ignore
+
+def _create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind=engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+
+
+class _Replica:
     """
-    Get an asynchronous session for database operations.
+    A read replica engine with a circuit breaker. Connection failures take it out of rotation
+    for `replica_retry_seconds`, and it is probed once before serving reads again.
+    """
+
+    def __init__(self, url: str) -> None:
+        self.engine = _create_engine(url)
+        self.down_until = 0.0
+        self.verified = False
+
+        event.listen(self.engine.sync_engine, 'handle_error', self._on_error)
+
+    def _on_error(self, context: ExceptionContext) -> None:
+        if context.is_disconnect or context.connection is None:
+            self.down_until = time.monotonic() + _database_config.replica_retry_seconds
+            self.verified = False
+            logger.warning('Read replica %s is unavailable', self.engine.url)
+
+    def ready(self) -> bool:
+        """
+        Checks whether the replica can serve reads, probing it if it was not verified yet.
+        Must be called from the session greenlet, like any other sync engine operation.
+
+        Returns:
+            bool: True if the replica can take the read.
+        """
+        if self.down_until > time.monotonic():
+            return False
+
+        if not self.verified:
+            try:
+                self.engine.sync_engine.connect().close()
+            except DBAPIError:
+                return False
+            self.verified = True
+
+        return True
+
+
+class _ReadSession(Session):
+    """
+    Session for read-only work, bound on first use to the next ready replica or the primary.
+    """
+
+    def get_bind(self, *args: Any, **kwargs: Any) -> Engine | Connection:
+        bind = self.info.get('read_bind')
+
+        if bind is None:
+            bind = self.info['read_bind'] = _pick_read_engine()
+
+        return bind
+
+
+def _pick_read_engine() -> Engine:
+    for _ in range(len(_replicas)):
+        replica = _replicas[next(_replica_counter) % len(_replicas)]
+        if replica.ready():
+            return replica.engine.sync_engine
+
+    return async_engine.sync_engine
+
+
+async_engine = _create_engine(_settings_app.database_url)
+async_session_factory = _create_session_factory(async_engine)
+read_session_factory = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=_ReadSession,
+    expire_on_commit=False,
+)
+
+_replicas = [_Replica(url) for url in _settings_app.database_replica_urls]
+_replica_counter = itertools.count()
+
+
+@event.listens_for(Session, 'after_commit')
+def _mark_request_wrote(session: Session) -> None:
+    request: Request | None = session.info.get('request')
+    if request is not None:
+        request.state.db_wrote = True
+
+
+def get_read_session_factory(request: Request | None = None) -> async_sessionmaker[AsyncSession]:
+    """
+    Picks the session factory for read-only work.
+
+    Reads go round robin to the replicas, skipping the ones whose circuit breaker is open
+    and falling back to the primary when none is ready. Clients that wrote in the last
+    `replica_stickiness_seconds` (read-your-writes cookie) read from the primary.
+
+    Args:
+        request (Request | None): The incoming request, used for the read-your-writes cookie.
+
+    Returns:
+        async_sessionmaker[AsyncSession]: The session factory to read from.
+    """
+    if not _replicas:
+        return async_session_factory
+
+    if request is not None and READ_YOUR_WRITES_COOKIE in request.cookies:
+        return async_session_factory
+
+    return read_session_factory
+
+
+async def get_session(request: Request) -> AsyncSession:  # type: ignore
+    """
+    Get an asynchronous session on the primary database for database operations.
+    A commit flags the request so the client sticks to the primary for its next reads.
 
     Returns:
         AsyncSession: An asynchronous session object.
 
     """
-    async_session = sessionmaker(
-        bind=async_engine,  # type: ignore
-        class_=AsyncSession,
-        expire_on_commit=False,
-    )
+    async with async_session_factory(info={'request': request}) as session:
+        yield session
+
+
+async def get_read_session(request: Request) -> AsyncSession:  # type: ignore
+    """
+    Get an asynchronous session for read-only database operations, on a replica when possible.
+
+    Returns:
+        AsyncSession: An asynchronous session object.
 
-    async with async_session() as session:
+    """
+    async with get_read_session_factory(request)() as session:
         yield session
+
+
+def get_pool_stats() -> dict[str, Any]:
+    """
+    Get the live usage statistics of the database connection pool.
+
+    Returns:
+        dict[str, Any]: Checked out connections, overflow and checkout wait times.
+    """
+    pool: InstrumentedAsyncAdaptedQueuePool = async_engine.pool  # type: ignore [assignment]
+
+    return pool.stats()
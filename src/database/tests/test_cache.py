@@ -0,0 +1,152 @@
+import pickle
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
+
+import pytest
+from sqlmodel import col, delete
+
+from auth.services.repository import AuthRepository
+from database import repository
+from database.cache import InMemoryCacheBackend, RepositoryCache
+from database.session import async_session_factory
+from user.models.general import User
+from user.services.repository import UserRepository
+
+pytestmark = pytest.mark.anyio
+
+UserFactory = Callable[..., Awaitable[dict[str, Any]]]
+
+
+@pytest.fixture
+def backend() -> InMemoryCacheBackend:
+    return InMemoryCacheBackend(max_size=100)
+
+
+@pytest.fixture
+def cache(backend: InMemoryCacheBackend, monkeypatch: pytest.MonkeyPatch) -> RepositoryCache:
+    cache = RepositoryCache(
+        backend=backend,
+        ttl=60,
+        model_ttls={},
+        negative_ttl=5,
+        local_max_size=100,
+        local_ttl=5,
+    )
+    monkeypatch.setattr(repository, 'get_repository_cache', lambda: cache)
+    return cache
+
+
+def _user(**fields: Any) -> User:
+    return User(
+        id=1,
+        username='john_doe',
+        first_name='John',
+        last_name='Doe',
+        email='john@example.com',
+        hashed_password='$2b$12$secret',
+        last_seen_at=datetime.now(timezone.utc),
+        **fields,
+    )
+
+
+async def test_cached_rows_leave_the_excluded_columns_out(
+    cache: RepositoryCache, backend: InMemoryCacheBackend
+) -> None:
+    await cache.set(User, 1, _user())
+
+    stored = await backend.get('user:1')
+    assert stored is not None
+    assert set(pickle.loads(stored)).isdisjoint(User.__cache_exclude__)
+
+    cached, user = await cache.get(User, 1)
+    assert cached
+    assert user.username == 'john_doe'
+    assert User.__cache_exclude__.isdisjoint(user.__dict__)
+
+
+async def test_missing_ids_are_cached_until_invalidated(cache: RepositoryCache) -> None:
+    assert await cache.get(User, 1) == (False, None)
+
+    await cache.set(User, 1, None)
+    assert await cache.get(User, 1) == (True, None)
+
+    await cache.invalidate(User, 1)
+    assert await cache.get(User, 1) == (False, None)
+    assert cache.stats()['invalidations'] == 1
+
+
+async def test_get_reads_through_and_writes_invalidate(
+    create_user: UserFactory, cache: RepositoryCache
+) -> None:
+    user = await create_user()
+
+    async with async_session_factory() as session:
+        assert await UserRepository(session).get(user['id']) is not None
+    async with async_session_factory() as session:
+        assert await UserRepository(session).get(user['id']) is not None
+    assert (cache.stats()['misses'], cache.stats()['hits']) == (1, 1)
+
+    async with async_session_factory() as session:
+        await UserRepository(session).update(user['id'], User(last_name='Roe'))
+    async with async_session_factory() as session:
+        updated = await UserRepository(session).get(user['id'])
+        assert updated is not None
+        assert updated.last_name == 'Roe'
+
+
+async def test_activity_writes_keep_the_cached_rows(
+    create_user: UserFactory, cache: RepositoryCache
+) -> None:
+    user = await create_user()
+    seen_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    async with async_session_factory() as session:
+        await UserRepository(session).get(user['id'])
+    invalidations = cache.stats()['invalidations']
+    async with async_session_factory() as session:
+        await AuthRepository(session).update_activity([(user['id'], None, seen_at)])
+
+    async with async_session_factory() as session:
+        cached = await UserRepository(session).get(user['id'])
+        assert cached is not None
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['invalidations'] == invalidations
+
+        assert cached.last_seen_at is not None
+        assert cached.last_seen_at.replace(tzinfo=timezone.utc) == seen_at
+        assert cached.hashed_password is not None
+
+
+async def test_cache_hits_load_the_excluded_columns(
+    create_user: UserFactory, cache: RepositoryCache
+) -> None:
+    user = await create_user()
+
+    async with async_session_factory() as session:
+        loaded = await UserRepository(session).get(user['id'])
+        assert loaded is not None
+        hashed_password = loaded.hashed_password
+
+    async with async_session_factory() as session:
+        cached = await UserRepository(session).get(user['id'])
+        assert cache.stats()['hits'] == 1
+        assert cached is not None
+        assert cached.hashed_password == hashed_password
+        assert cached.last_login_at is None
+
+
+async def test_cache_hits_of_deleted_rows_return_none(
+    create_user: UserFactory, cache: RepositoryCache
+) -> None:
+    user = await create_user()
+
+    async with async_session_factory() as session:
+        await UserRepository(session).get(user['id'])
+    async with async_session_factory() as session:
+        # Deleted without going through the repository, as another worker would.
+        await session.execute(delete(User).where(col(User.id) == user['id']))
+        await session.commit()
+
+    async with async_session_factory() as session:
+        assert await UserRepository(session).get(user['id']) is None
+        assert cache.stats()['hits'] == 1
@@ -0,0 +1,78 @@
+from typing import Any, AsyncIterator, cast
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from database.instrumentation import (
+    current_query_stats,
+    instrument_engine,
+    query_budget,
+    start_query_stats,
+)
+from database.middleware import QueryStatsMiddleware
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def engine() -> AsyncIterator[AsyncEngine]:
+    engine = create_async_engine('sqlite+aiosqlite://')
+    instrument_engine(engine)
+    yield engine
+    await engine.dispose()
+
+
+async def test_failed_statements_do_not_shift_the_timings(engine: AsyncEngine) -> None:
+    stats = start_query_stats()
+
+    async with engine.connect() as connection:
+        with pytest.raises(OperationalError):
+            await connection.execute(text('SELECT * FROM missing'))
+        await connection.execute(text('SELECT 1'))
+
+        raw = await connection.get_raw_connection()
+        assert raw.info['query_started_at'] == []
+
+    assert stats.count == 1
+    assert list(stats.shapes) == ['SELECT 1']
+
+
+def _budget_app(strict: bool) -> httpx.AsyncClient:
+    app = FastAPI()
+
+    @app.get('/items')
+    @query_budget(1)
+    async def items() -> dict[str, Any]:
+        stats = current_query_stats()
+        assert stats is not None
+        stats.record('SELECT 1', 0)
+        stats.record('SELECT 2', 0)
+        return {'items': []}
+
+    middleware = QueryStatsMiddleware(app)
+    middleware.strict = strict
+
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=cast(Any, middleware)), base_url='http://test'
+    )
+
+
+async def test_strict_budget_answers_an_error_instead_of_the_response() -> None:
+    async with _budget_app(strict=True) as client:
+        response = await client.get('/items')
+
+    assert response.status_code == 500
+    assert response.json()['data']['code'] == 'internal_server_error'
+
+
+async def test_budget_is_only_logged_when_not_strict(caplog: pytest.LogCaptureFixture) -> None:
+    async with _budget_app(strict=False) as client:
+        response = await client.get('/items')
+
+    assert response.status_code == 200
+    assert response.json() == {'items': []}
+    assert 'ran 2 SQL statements, its query budget is 1' in caplog.text
@@ -0,0 +1,70 @@
+import asyncio
+from typing import Sequence
+
+import pytest
+
+from database.loader import ModelLoader
+
+pytestmark = pytest.mark.anyio
+
+
+class _Source:
+    def __init__(self, values: dict[int, str]) -> None:
+        self.values = values
+        self.batches: list[list[int]] = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def batch_load(self, keys: Sequence[int]) -> Sequence[str | None]:
+        self.batches.append(list(keys))
+        await self.release.wait()
+        return [self.values.get(key) for key in keys]
+
+
+async def test_load_coalesces_the_keys_of_one_tick_into_one_batch() -> None:
+    source = _Source({1: 'a', 2: 'b'})
+    loader = ModelLoader(source.batch_load)
+
+    results = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1), loader.load(3))
+
+    assert list(results) == ['a', 'b', 'a', None]
+    assert source.batches == [[1, 2, 3]]
+
+
+async def test_load_runs_a_new_batch_for_later_keys() -> None:
+    source = _Source({1: 'a', 2: 'b'})
+    loader = ModelLoader(source.batch_load)
+
+    assert await loader.load(1) == 'a'
+    assert await loader.load(2) == 'b'
+    assert source.batches == [[1], [2]]
+
+
+async def test_cancelling_a_caller_does_not_cancel_the_others() -> None:
+    source = _Source({1: 'a'})
+    source.release.clear()
+    loader = ModelLoader(source.batch_load)
+
+    cancelled = asyncio.ensure_future(loader.load(1))
+    other = asyncio.ensure_future(loader.load(1))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    source.release.set()
+
+    assert await other == 'a'
+    assert cancelled.cancelled()
+    assert source.batches == [[1]]
+
+
+async def test_a_failing_batch_fails_every_caller() -> None:
+    async def batch_load(keys: Sequence[int]) -> Sequence[str | None]:
+        raise RuntimeError('database is down')
+
+    loader: ModelLoader[int, str] = ModelLoader(batch_load)
+
+    results = await asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True)
+
+    assert [str(result) for result in results] == ['database is down'] * 2
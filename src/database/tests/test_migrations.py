@@ -0,0 +1,53 @@
+from typing import Iterator
+
+import pytest
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy.engine import Connection
+
+from database.migrations import backfill, create_index_concurrently
+
+
+@pytest.fixture
+def connection() -> Iterator[Connection]:
+    engine = sa.create_engine('sqlite://')
+
+    with engine.connect() as connection:
+        connection.execute(sa.text('CREATE TABLE item (id INTEGER PRIMARY KEY, a INT, b INT)'))
+        connection.execute(
+            sa.text('INSERT INTO item (id, a, b) VALUES (:id, :a, NULL)'),
+            [{'id': id, 'a': id % 3} for id in range(1, 11)],
+        )
+        connection.commit()
+
+        with Operations.context(MigrationContext.configure(connection)):
+            yield connection
+
+
+def _rows(connection: Connection) -> list[tuple[int, int | None]]:
+    return [tuple(row) for row in connection.execute(sa.text('SELECT id, b FROM item ORDER BY id'))]
+
+
+def test_backfill_updates_the_matching_rows_in_batches(connection: Connection) -> None:
+    updated = backfill(
+        'item', {'b': sa.text('a + 1')}, where='a = 0 OR a = 1', batch_size=3, pause_seconds=0
+    )
+
+    assert updated == 7
+    assert _rows(connection) == [
+        (id, id % 3 + 1 if id % 3 in (0, 1) else None) for id in range(1, 11)
+    ]
+
+
+def test_backfill_resumes_with_the_rows_left(connection: Connection) -> None:
+    backfill('item', {'b': 0}, where='id <= 4', batch_size=2, pause_seconds=0)
+
+    assert backfill('item', {'b': 1}, where='b IS NULL', batch_size=4, pause_seconds=0) == 6
+    assert [b for _, b in _rows(connection)] == [0] * 4 + [1] * 6
+
+
+def test_create_index_concurrently_falls_back_to_a_plain_index(connection: Connection) -> None:
+    create_index_concurrently('ix_item_a', 'item', ['a'])
+
+    assert [index['name'] for index in sa.inspect(connection).get_indexes('item')] == ['ix_item_a']
@@ -0,0 +1,38 @@
+import base64
+import json
+
+import pytest
+
+from core.exceptions.exceptions import InvalidCursorException
+from database.pagination import decode_cursor, encode_cursor
+
+
+def _cursor(payload: object) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+@pytest.mark.parametrize('id', [0, 1, 2**53])
+def test_decode_cursor_returns_the_encoded_id(id: int) -> None:
+    cursor = encode_cursor(id)
+
+    assert '=' not in cursor
+    assert decode_cursor(cursor) == id
+
+
+@pytest.mark.parametrize(
+    'cursor',
+    [
+        '',
+        'not base64!',
+        _cursor([1]),
+        _cursor({'offset': 1}),
+        _cursor({'id': 'abc'}),
+        _cursor({'id': '1'}),
+        _cursor({'id': 1.5}),
+        _cursor({'id': True}),
+        _cursor({'id': None}),
+    ],
+)
+def test_decode_cursor_rejects_cursors_not_made_by_encode_cursor(cursor: str) -> None:
+    with pytest.raises(InvalidCursorException):
+        decode_cursor(cursor)
@@ -0,0 +1,45 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from database.repository import repository_flights
+from database.session import async_engine, async_session_factory, read_session_factory
+from user.services.repository import UserRepository
+
+pytestmark = pytest.mark.anyio
+
+UserFactory = Callable[..., Awaitable[dict[str, Any]]]
+
+
+async def test_concurrent_reads_are_shared_on_the_same_database_only(
+    create_user: UserFactory,
+) -> None:
+    user = await create_user()
+    # Another engine on the same database stands in for a replica.
+    replica = create_async_engine(async_engine.url)
+
+    try:
+        async with (
+            async_session_factory() as primary_session,
+            async_session_factory() as other_primary_session,
+            read_session_factory() as replica_session,
+        ):
+            replica_session.info['read_bind'] = replica.sync_engine
+            before = repository_flights.stats()
+
+            results = await asyncio.gather(
+                *(
+                    UserRepository(session).get(user['id'])
+                    for session in (primary_session, other_primary_session, replica_session)
+                )
+            )
+
+            after = repository_flights.stats()
+    finally:
+        await replica.dispose()
+
+    assert [result.id if result else None for result in results] == [user['id']] * 3
+    assert after['calls'] - before['calls'] == 2
+    assert after['coalesced'] - before['coalesced'] == 1
@@ -1,22 +1,91 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI, HTTPException, status
 from fastapi.exceptions import RequestValidationError, ValidationException
+from fastapi.responses import PlainTextResponse
 
+from auth.activity import activity_buffer
+from auth.cache import principal_cache
 from auth.router import router as auth_router
+from auth.throttling import login_throttle
+from auth.utils import password_hasher
 from config.settings import get_settings
-from core.exceptions.handler import http_exception_handler
+from core.exceptions.handler import http_exception_handler, render_error
+from core.metrics import metrics_registry
+from core.middleware import ServerTimingMiddleware
 from core.responses import CJSONResponse
+from core.routing import CAPIRoute
 from core.schemas.responses import (
+    DatabasePoolResponse,
     InformationalResponse,
     ResponseSchema,
 )
 from core.tags import OpenAPITags
+from database.cache import get_repository_cache
+from database.middleware import QueryStatsMiddleware, ReadYourWritesMiddleware
+from database.repository import repository_flights
+from database.session import get_pool_stats
 from user.routers.general import router as user_router
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Runs the periodic writes of the user activity buffer, and writes what is still
+    buffered on shutdown.
+    """
+    activity_buffer.start()
+    yield
+    await activity_buffer.stop()
+
+
 app = FastAPI(
     **settings.api_config.model_dump(),
     default_response_class=CJSONResponse,
+    lifespan=lifespan,
+)
+app.router.route_class = CAPIRoute
+
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(ServerTimingMiddleware)
+
+metrics_registry.register_collector(
+    'db_pool', get_pool_stats, counters=('checkouts', 'timeouts', 'wait_time_total')
+)
+metrics_registry.register_collector(
+    'auth_principal_cache', principal_cache.stats, counters=('hits', 'misses')
+)
+metrics_registry.register_collector(
+    'auth_password_hasher',
+    password_hasher.stats,
+    counters=('calls', 'wait_time_total', 'run_time_total'),
+)
+metrics_registry.register_collector(
+    'auth_login_throttle',
+    login_throttle.stats,
+    counters=('admitted', 'rejected_ip', 'rejected_username', 'rejected_concurrency'),
+)
+metrics_registry.register_collector(
+    'user_activity', activity_buffer.stats, counters=('flushes', 'flushed_users', 'failures')
+)
+
+metrics_registry.register_collector(
+    'repository_singleflight', repository_flights.stats, counters=('calls', 'coalesced')
+)
+
+repository_cache = get_repository_cache()
+if repository_cache is not None:
+    metrics_registry.register_collector(
+        'repository_cache', repository_cache.stats, counters=('hits', 'misses', 'invalidations')
+    )
+metrics_registry.register_collector(
+    'error_response_cache',
+    lambda: render_error.cache_info()._asdict(),
+    counters=('hits', 'misses'),
 )
 
 app.add_exception_handler(Exception, http_exception_handler)
@@ -55,3 +124,37 @@ async def info() -> ResponseSchema[InformationalResponse]:
     )
 
     return response
+
+
+@app.post(
+    '/info/database',
+    tags=[OpenAPITags.INFORMATIONAL],
+    description='Database connection pool statistics',
+    status_code=status.HTTP_200_OK,
+)
+async def database_info() -> ResponseSchema[DatabasePoolResponse]:
+    """
+    Database connection pool statistics
+
+    Returns:
+        ResponseSchema[DatabasePoolResponse]: Live usage of the database connection pool
+    """
+    response = ResponseSchema(
+        code=0,
+        data=DatabasePoolResponse(**get_pool_stats()),
+        status_code=status.HTTP_200_OK,
+    )
+
+    return response
+
+
+@app.get('/metrics', include_in_schema=False, response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """
+    Request and phase latency histograms per route, plus the pool, cache and hasher statistics,
+    in the Prometheus text format.
+
+    Returns:
+        PlainTextResponse: The metrics to scrape.
+    """
+    return PlainTextResponse(metrics_registry.render(), media_type='text/plain; version=0.0.4')
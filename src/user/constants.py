@@ -0,0 +1,28 @@
+from enum import StrEnum
+
+USER_EXPORT_BATCH_SIZE = 1000
+USER_BATCH_CREATE_MAX_SIZE = 500
+
+
+class UserExportFormat(StrEnum):
+    NDJSON = 'ndjson'
+    CSV = 'csv'
+
+
+class UserBatchItemStatus(StrEnum):
+    CREATED = 'created'
+    CONFLICT = 'conflict'
+
+
+USER_EXPORT_MEDIA_TYPES = {
+    UserExportFormat.NDJSON: 'application/x-ndjson',
+    UserExportFormat.CSV: 'text/csv',
+}
+
+__all__ = [
+    'USER_BATCH_CREATE_MAX_SIZE',
+    'USER_EXPORT_BATCH_SIZE',
+    'USER_EXPORT_MEDIA_TYPES',
+    'UserBatchItemStatus',
+    'UserExportFormat',
+]
@@ -10,3 +10,12 @@ class UserNotFoundException(APIHTTPException):
             error_code='record_not_found',
             status_code=status.HTTP_404_NOT_FOUND,
         )
+
+
+class UserConflictException(APIHTTPException):
+    def __init__(self) -> None:
+        super().__init__(
+            detail='Username or email already exists',
+            error_code='record_conflict',
+            status_code=status.HTTP_409_CONFLICT,
+        )
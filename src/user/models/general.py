@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import ClassVar, Optional
 
 from sqlalchemy import Column, DateTime, func
 from sqlmodel import Field
@@ -12,12 +12,19 @@ class User(BaseSQLModel, table=True):
     This class represents the User model.
     """
 
+    # The password hash stays out of the shared cache, and the activity times are written
+    # too often to keep the cached rows valid.
+    __cache_exclude__: ClassVar[frozenset[str]] = frozenset(
+        {'hashed_password', 'last_login_at', 'last_seen_at'}
+    )
+
     username: str = Field(max_length=50, unique=True)
     first_name: str = Field(max_length=100)
     last_name: str = Field(max_length=100)
     email: str = Field(max_length=100, unique=True)
     hashed_password: Optional[str] = Field(default=None)
     is_active: bool = Field(default=True)
+    token_version: int = Field(default=0, sa_column_kwargs={'server_default': '0'})
     created_at: Optional[datetime] = Field(
         default=None,
         sa_column=Column(
@@ -35,6 +42,14 @@ class User(BaseSQLModel, table=True):
             nullable=True,
         ),
     )
+    last_login_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=True),
+    )
+    last_seen_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=True),
+    )
 
     @property
     def full_name(self) -> str:
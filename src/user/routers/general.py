@@ -1,15 +1,29 @@
-from typing import Annotated
+from typing import Annotated, AsyncIterator, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from auth.dependencies import authentication
-from core.schemas.responses import ResponseSchema
+from core.conditional import ResourceValidators, is_conditional
+from core.constants import PAGINATION_DEFAULT_LIMIT, PAGINATION_MAX_LIMIT
+from core.responses import CJSONResponse
+from core.routing import CAPIRoute
+from core.schemas.responses import PaginatedResponse, ResponseSchema
 from core.tags import OpenAPITags
-from database.session import get_session
+from core.timing import phase
+from database.instrumentation import query_budget
+from database.session import get_read_session, get_read_session_factory, get_session
+from user.constants import USER_EXPORT_MEDIA_TYPES, UserBatchItemStatus, UserExportFormat
+from user.exceptions import UserNotFoundException
 from user.models.general import User
-from user.schemas.general import UserSchema
-from user.schemas.requests import UserCreateRequestBody, UserUpdateRequestBody
+from user.schemas.general import UserBatchItemResult, UserSchema
+from user.schemas.requests import (
+    UserBatchCreateRequestBody,
+    UserCreateRequestBody,
+    UserUpdateRequestBody,
+)
 from user.services.general import UserGeneralService
 from user.services.repository import UserRepository
 
@@ -18,56 +32,82 @@ router = APIRouter(
     prefix=f'/{_MODULE}',
     tags=[OpenAPITags.USERS],
     dependencies=[Depends(authentication)],
+    route_class=CAPIRoute,
 )
 
 
 @router.get(
     '/me',
     description='Retrieve the current user.',
+    response_model=ResponseSchema[UserSchema],
 )
+@query_budget(2)
 async def get_current_user(
     user: Annotated[User, Depends(authentication)],
-) -> ResponseSchema[UserSchema]:
+    request: Request,
+    db_session: AsyncSession = Depends(get_read_session),
+) -> Response:
     """
     Get the current user.
 
+    Answers `304 Not Modified` when the `If-None-Match` or `If-Modified-Since`
+    validators of the client are still current. The user is reloaded when it is a
+    stateless token snapshot, which has no `updated_at`.
+
     Parameters:
     - user: The authenticated user.
+    - db_session: The database session, used to reload a token snapshot.
 
     Returns:
     - ResponseSchema[UserSchema]: The response containing the user data.
 
     """
-    return ResponseSchema(
-        code=0,
-        data=UserSchema.model_validate(user, from_attributes=True),
-        status_code=status.HTTP_200_OK,
-    )
+    if user.updated_at is None:
+        loaded_user = await UserRepository(db_session).get(user.id)
+        if loaded_user is None:
+            raise UserNotFoundException
+        user = loaded_user
+
+    validators = ResourceValidators(user.id, user.updated_at)
+    if validators.is_not_modified(request):
+        return validators.not_modified()
+
+    with phase('validate'):
+        data = UserSchema.model_validate(user, from_attributes=True)
+
+    response = ResponseSchema(code=0, data=data, status_code=status.HTTP_200_OK)
+    return CJSONResponse(content=response, headers=validators.headers)
 
 
 @router.get('')
+@query_budget(2)
 async def get_all_users(
-    db_session: AsyncSession = Depends(get_session),
-) -> ResponseSchema[list[UserSchema]]:
+    limit: Annotated[int, Query(ge=1, le=PAGINATION_MAX_LIMIT)] = PAGINATION_DEFAULT_LIMIT,
+    cursor: Annotated[Optional[str], Query()] = None,
+    db_session: AsyncSession = Depends(get_read_session),
+) -> ResponseSchema[PaginatedResponse[UserSchema]]:
     """
-    Retrieves a list of all users from the database.
+    Retrieves a page of users from the database, ordered by ID.
 
     Parameters:
+        limit: The maximum number of users to return.
+        cursor: The `next_cursor` of the previous page, omitted for the first page.
         db_session: The database session to use for the operation.
 
     Returns:
-        A ResponseSchema object containing the serialized list of UserResponse objects.
+        A ResponseSchema object containing the page of UserResponse objects and the next cursor.
     """
     _service = UserGeneralService(UserRepository(db_session))
-    user_list = await _service.get_all()
+    user_page = await _service.get_page(limit, cursor)
     return ResponseSchema(
         code=0,
-        data=user_list,
+        data=user_page,
         status_code=status.HTTP_200_OK,
     )
 
 
 @router.post('')
+@query_budget(5)
 async def create_user(
     data: UserCreateRequestBody, async_session: AsyncSession = Depends(get_session)
 ) -> ResponseSchema[UserSchema]:
@@ -90,31 +130,116 @@ async def create_user(
     )
 
 
-@router.get('/{id}')
+@router.post('/batch', description='Create many users in one transaction.')
+async def create_users(
+    data: UserBatchCreateRequestBody, async_session: AsyncSession = Depends(get_session)
+) -> ResponseSchema[list[UserBatchItemResult]]:
+    """
+    Create many users at once.
+
+    Items whose username or email is already taken are reported as conflicts
+    and the rest are created.
+
+    Args:
+        data (UserBatchCreateRequestBody): The users to create.
+
+    Returns:
+        ResponseSchema[list[UserBatchItemResult]]: One result per item, 201 when every
+        user was created and 207 when some of them were rejected.
+    """
+    _service = UserGeneralService(UserRepository(async_session))
+    results = await _service.create_many(data.items)
+
+    all_created = all(result.status == UserBatchItemStatus.CREATED for result in results)
+
+    return ResponseSchema(
+        code=0,
+        data=results,
+        status_code=status.HTTP_201_CREATED if all_created else status.HTTP_207_MULTI_STATUS,
+    )
+
+
+async def _export_users(
+    format: UserExportFormat, session_factory: async_sessionmaker[AsyncSession]
+) -> AsyncIterator[str]:
+    """
+    Streams the user export with its own session, so the server-side cursor lives
+    exactly as long as the response body.
+    """
+    async with session_factory() as db_session:
+        _service = UserGeneralService(UserRepository(db_session))
+        async for chunk in _service.export(format):
+            yield chunk
+
+
+@router.get(
+    '/export',
+    description='Export every user as NDJSON or CSV.',
+    response_class=StreamingResponse,
+)
+@query_budget(1)
+async def export_users(
+    request: Request,
+    format: Annotated[UserExportFormat, Query()] = UserExportFormat.NDJSON,
+) -> StreamingResponse:
+    """
+    Stream every user without buffering the table in memory.
+
+    Args:
+        request (Request): The incoming request, used to pick the read session.
+        format (UserExportFormat): The export format, NDJSON by default.
+
+    Returns:
+        StreamingResponse: The export, sent as rows are read from the database.
+    """
+    return StreamingResponse(
+        _export_users(format, get_read_session_factory(request)),
+        media_type=USER_EXPORT_MEDIA_TYPES[format],
+        headers={'Content-Disposition': f'attachment; filename="users.{format}"'},
+    )
+
+
+@router.get('/{id}', response_model=ResponseSchema[UserSchema])
+@query_budget(3)
 async def get_user_by_id(
-    id: int, db_session: AsyncSession = Depends(get_session)
-) -> ResponseSchema[UserSchema]:
+    id: int, request: Request, db_session: AsyncSession = Depends(get_read_session)
+) -> Response:
     """
     Retrieve a user by their ID.
 
+    Conditional requests are first checked against the modification time alone,
+    the full row is only loaded when the client copy is stale.
+
     Args:
         id (int): The ID of the user to retrieve.
-        db_session (AsyncSession, optional): The database session. Defaults to Depends(get_session).
+        request (Request): The incoming request, used for its validator headers.
+        db_session (AsyncSession, optional): The database session.
+            Defaults to Depends(get_read_session).
 
     Returns:
         ResponseSchema[UserResponse]: The response schema containing the user data.
 
     """
     _service = UserGeneralService(UserRepository(db_session))
+
+    if is_conditional(request):
+        validators = ResourceValidators(id, await _service.get_last_modified(id))
+        if validators.is_not_modified(request):
+            return validators.not_modified()
+
     user = await _service.get(id)
-    return ResponseSchema(
+    validators = ResourceValidators(user.id, user.updated_at)
+
+    response = ResponseSchema(
         code=0,
         data=user,
         status_code=status.HTTP_200_OK,
     )
+    return CJSONResponse(content=response, headers=validators.headers)
 
 
 @router.put('/{id}')
+@query_budget(2)
 async def update_user(
     id: int, data: UserUpdateRequestBody, db_session: AsyncSession = Depends(get_session)
 ) -> ResponseSchema[UserSchema]:
@@ -140,7 +265,33 @@ async def update_user(
     )
 
 
+@router.post('/{id}/deactivate')
+@query_budget(2)
+async def deactivate_user(
+    id: int, db_session: AsyncSession = Depends(get_session)
+) -> ResponseSchema[UserSchema]:
+    """
+    Deactivate a user by their ID, revoking every token issued to them.
+
+    Args:
+        id (int): The ID of the user to deactivate.
+        db_session (AsyncSession, optional): The database session. Defaults to Depends(get_session).
+
+    Returns:
+        ResponseSchema[UserSchema]: The response schema containing the deactivated user data.
+    """
+    _service = UserGeneralService(UserRepository(db_session))
+    user = await _service.deactivate(id)
+
+    return ResponseSchema(
+        code=0,
+        data=user,
+        status_code=status.HTTP_200_OK,
+    )
+
+
 @router.delete('/{user_id}')
+@query_budget(2)
 async def delete_user(
     id: int, db_session: AsyncSession = Depends(get_session)
 ) -> ResponseSchema[UserSchema]:
@@ -1,7 +1,11 @@
 from datetime import datetime
+from typing import Optional
 
 from pydantic import BaseModel, Field
 
+from core.schemas.responses import ErrorResponse
+from user.constants import UserBatchItemStatus
+
 
 class UserSchema(BaseModel):
     """
@@ -18,3 +22,16 @@ class UserSchema(BaseModel):
     is_active: bool = Field(examples=[True, False])
     created_at: datetime = Field(examples=[datetime.utcnow()])
     updated_at: datetime = Field(examples=[datetime.utcnow()])
+
+
+class UserBatchItemResult(BaseModel):
+    """
+    This is a response schema for one item of a batch user creation.
+
+    `data` is set for created users and `error` for rejected ones.
+    """
+
+    index: int = Field(description='Position of the item in the request', examples=[0, 1])
+    status: UserBatchItemStatus = Field(examples=['created', 'conflict'])
+    data: Optional[UserSchema] = Field(default=None)
+    error: Optional[ErrorResponse] = Field(default=None)
@@ -2,6 +2,8 @@ from typing import Any
 
 from pydantic import BaseModel, Field, root_validator
 
+from user.constants import USER_BATCH_CREATE_MAX_SIZE
+
 
 class UserCreateRequestBody(BaseModel):
     """
@@ -36,6 +38,18 @@ class UserCreateRequestBody(BaseModel):
         return values
 
 
+class UserBatchCreateRequestBody(BaseModel):
+    """
+    This is a request body schema for creating many users at once.
+    """
+
+    items: list[UserCreateRequestBody] = Field(
+        min_length=1,
+        max_length=USER_BATCH_CREATE_MAX_SIZE,
+        description='Users to create, results are returned in the same order',
+    )
+
+
 class UserUpdateRequestBody(BaseModel):
     """
     This is a request body schema for updating a user.
@@ -1,6 +1,16 @@
-from user.exceptions import UserNotFoundException
+import csv
+import io
+from datetime import datetime
+from typing import AsyncIterator
+
+from sqlalchemy.exc import IntegrityError
+
+from auth.cache import principal_cache, token_state_cache
+from core.schemas.responses import ErrorResponse, PaginatedResponse
+from user.constants import USER_EXPORT_BATCH_SIZE, UserBatchItemStatus, UserExportFormat
+from user.exceptions import UserConflictException, UserNotFoundException
 from user.models.general import User
-from user.schemas.general import UserSchema
+from user.schemas.general import UserBatchItemResult, UserSchema
 from user.schemas.requests import UserCreateRequestBody, UserUpdateRequestBody
 from user.services.repository import UserRepository
 
@@ -37,16 +47,72 @@ class UserGeneralService:
 
         return UserSchema.model_validate(user, from_attributes=True)
 
-    async def get_all(self) -> list[UserSchema]:
+    async def get_last_modified(self, id: int) -> datetime:
+        """
+        Retrieves when a user was last modified, used to answer conditional requests.
+
+        Args:
+            id (int): The ID of the user.
+
+        Returns:
+            datetime: The modification time of the user.
+
+        Raises:
+            APIHTTPException: If the user is not found.
+        """
+        updated_at = await self._repository.get_updated_at(id)
+
+        if updated_at is None:
+            raise UserNotFoundException
+
+        return updated_at
+
+    async def get_page(
+        self, limit: int, cursor: str | None = None
+    ) -> PaginatedResponse[UserSchema]:
         """
-        Retrieves all users.
+        Retrieves a page of users ordered by ID.
+
+        Args:
+            limit (int): The maximum number of users to return.
+            cursor (str | None): The cursor returned with the previous page.
 
         Returns:
-            Sequence[User]: A sequence of all users.
+            PaginatedResponse[UserSchema]: The users of the page and the next page cursor.
+        """
+        user_list, next_cursor = await self._repository.get_page(limit, cursor)
+
+        return PaginatedResponse(
+            items=[UserSchema.model_validate(user, from_attributes=True) for user in user_list],
+            next_cursor=next_cursor,
+        )
+
+    async def export(self, format: UserExportFormat) -> AsyncIterator[str]:
+        """
+        Exports every user, one chunk of serialized rows per database batch.
+
+        Args:
+            format (UserExportFormat): The export format, NDJSON or CSV.
+
+        Yields:
+            str: The next chunk of the export, the CSV header comes first on its own.
         """
-        user_list = await self._repository.get_all()
+        fields = list(UserSchema.model_fields)
+
+        if format == UserExportFormat.CSV:
+            yield ','.join(fields) + '\r\n'
 
-        return [UserSchema.model_validate(user, from_attributes=True) for user in user_list]
+        async for user_list in self._repository.stream_batches(USER_EXPORT_BATCH_SIZE):
+            rows = [UserSchema.model_validate(user, from_attributes=True) for user in user_list]
+
+            if format == UserExportFormat.NDJSON:
+                yield ''.join(f'{row.model_dump_json()}\n' for row in rows)
+                continue
+
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=fields)
+            writer.writerows(row.model_dump(mode='json') for row in rows)
+            yield buffer.getvalue()
 
     async def create(self, data: UserCreateRequestBody) -> UserSchema:
         """
@@ -67,6 +133,63 @@ class UserGeneralService:
 
         return UserSchema.model_validate(user, from_attributes=True)
 
+    async def create_many(self, items: list[UserCreateRequestBody]) -> list[UserBatchItemResult]:
+        """
+        Creates many users at once, skipping the ones whose username or email is taken.
+
+        Args:
+            items (list[UserCreateRequestBody]): The users to create.
+
+        Returns:
+            list[UserBatchItemResult]: One result per item, in the same order as the input.
+
+        Raises:
+            APIHTTPException: If a concurrent request took a username or email meanwhile.
+        """
+        usernames, emails = await self._repository.get_taken_credentials(
+            (item.username for item in items),
+            (item.email for item in items),
+        )
+
+        results: dict[int, UserBatchItemResult] = {}
+        accepted: list[tuple[int, UserCreateRequestBody]] = []
+
+        for index, item in enumerate(items):
+            if item.username in usernames or item.email in emails:
+                field = 'username' if item.username in usernames else 'email'
+                results[index] = UserBatchItemResult(
+                    index=index,
+                    status=UserBatchItemStatus.CONFLICT,
+                    error=ErrorResponse(
+                        code=f'{field}_conflict',
+                        description=f'A user with this {field} already exists',
+                    ),
+                )
+                continue
+
+            usernames.add(item.username)
+            emails.add(item.email)
+            accepted.append((index, item))
+
+        if accepted:
+            try:
+                users = await self._repository.create_many_with_passwords(
+                    [User.model_validate(item, from_attributes=True) for _, item in accepted],
+                    [item.password for _, item in accepted],
+                )
+            except IntegrityError:
+                await self._repository.async_session.rollback()
+                raise UserConflictException
+
+            for (index, _), user in zip(accepted, users):
+                results[index] = UserBatchItemResult(
+                    index=index,
+                    status=UserBatchItemStatus.CREATED,
+                    data=UserSchema.model_validate(user, from_attributes=True),
+                )
+
+        return [results[index] for index in range(len(items))]
+
     async def update(self, id: int, data: UserUpdateRequestBody) -> UserSchema:
         """
         Updates a user by ID.
@@ -83,6 +206,8 @@ class UserGeneralService:
         """
         user = User.model_validate(data, from_attributes=True)
         updated_user = await self._repository.update(id, user)
+        principal_cache.invalidate_user(id)
+        token_state_cache.invalidate_user(id)
 
         if updated_user is None:
             raise UserNotFoundException
@@ -103,7 +228,32 @@ class UserGeneralService:
             APIHTTPException: If the user is not found.
         """
         deleted_user = await self._repository.delete(id)
+        principal_cache.invalidate_user(id)
+        token_state_cache.invalidate_user(id)
+
         if deleted_user is None:
             raise UserNotFoundException
 
         return UserSchema.model_validate(deleted_user, from_attributes=True)
+
+    async def deactivate(self, id: int) -> UserSchema:
+        """
+        Deactivates a user by ID, revoking its tokens.
+
+        Args:
+            id (int): The ID of the user to deactivate.
+
+        Returns:
+            User: The deactivated user.
+
+        Raises:
+            APIHTTPException: If the user is not found.
+        """
+        deactivated_user = await self._repository.deactivate(id)
+        principal_cache.invalidate_user(id)
+        token_state_cache.invalidate_user(id)
+
+        if deactivated_user is None:
+            raise UserNotFoundException
+
+        return UserSchema.model_validate(deactivated_user, from_attributes=True)
@@ -1,6 +1,12 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Iterable, Sequence
+
+from sqlalchemy import bindparam, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import col, or_, select
 
-from auth.utils import get_password_hash
+from auth.utils import get_password_hash_async
 from database.repository import SQLModelRepository
 from user.models.general import User
 
@@ -11,7 +17,7 @@ class UserRepository(SQLModelRepository[User]):
 
     async def set_password(self, user: User, password: str) -> User:
         """
-        Sets the password for a user.
+        Sets the password for a user and bumps its token version, revoking its tokens.
 
         Args:
             id (str): The ID of the user.
@@ -22,10 +28,127 @@ class UserRepository(SQLModelRepository[User]):
         """
         salt = user.created_at.isoformat()  # type: ignore
 
-        user.hashed_password = get_password_hash(password=password, salt=salt)
+        user.hashed_password = await get_password_hash_async(password=password, salt=salt)
+        user.token_version += 1
 
         self.async_session.add(user)
-        await self.async_session.commit()
-        await self.async_session.refresh(user)
+        await self._commit(user)
+        await self._invalidate(user.id)
 
         return user
+
+    async def deactivate(self, id: Any) -> User | None:
+        """
+        Deactivates a user and bumps its token version, revoking its tokens.
+
+        Args:
+            id (Any): The ID of the user.
+
+        Returns:
+            User | None: The deactivated user, or None if the user does not exist.
+        """
+        statement = (
+            update(User)
+            .where(col(User.id) == id)
+            .values(is_active=False, token_version=col(User.token_version) + 1)
+            .returning(User)
+            .execution_options(populate_existing=True)
+        )
+        result = await self._execute(statement)
+        record: User | None = result.scalar_one_or_none()
+        await self._commit()
+        await self._invalidate(id)
+        return record
+
+    async def get_updated_at(self, id: Any) -> datetime | None:
+        """
+        Gets when a user was last modified without loading the whole row.
+
+        Args:
+            id (Any): The ID of the user.
+
+        Returns:
+            datetime | None: The modification time, or None if the user does not exist.
+        """
+        statement = select(col(User.updated_at)).where(col(User.id) == id)
+        result = await self._execute(statement)
+        return result.scalar_one_or_none()
+
+    async def get_taken_credentials(
+        self, usernames: Iterable[str], emails: Iterable[str]
+    ) -> tuple[set[str], set[str]]:
+        """
+        Finds which of the given usernames and emails already belong to a user.
+
+        Args:
+            usernames (Iterable[str]): The usernames to check.
+            emails (Iterable[str]): The emails to check.
+
+        Returns:
+            tuple[set[str], set[str]]: The taken usernames and the taken emails.
+        """
+        usernames, emails = set(usernames), set(emails)
+        statement = select(col(User.username), col(User.email)).where(
+            or_(col(User.username).in_(usernames), col(User.email).in_(emails))
+        )
+        result = await self._execute(statement)
+        rows = result.all()
+
+        return (
+            {username for username, _ in rows if username in usernames},
+            {email for _, email in rows if email in emails},
+        )
+
+    async def create_many_with_passwords(
+        self, users: Sequence[User], passwords: Sequence[str]
+    ) -> Sequence[User]:
+        """
+        Creates many users and sets their passwords in a single transaction.
+
+        Users are inserted with one multi-row INSERT ... RETURNING, passwords are hashed
+        in parallel with the server generated `created_at` as salt, and the hashes are
+        written with one executemany UPDATE.
+
+        Args:
+            users (Sequence[User]): The users to create.
+            passwords (Sequence[str]): The plain text passwords, in the same order as users.
+
+        Returns:
+            Sequence[User]: The created users, in the same order as the input.
+        """
+        values = [
+            user.model_dump(exclude={'id', 'hashed_password', 'created_at', 'updated_at'})
+            for user in users
+        ]
+        statement = insert(User).returning(User, sort_by_parameter_order=True)
+        result = await self._execute(statement, values)
+        created_users: Sequence[User] = result.scalars().all()
+
+        hashes = await asyncio.gather(
+            *(
+                get_password_hash_async(password=password, salt=user.created_at.isoformat())  # type: ignore
+                for user, password in zip(created_users, passwords)
+            )
+        )
+
+        # `updated_at` is set to itself so storing the hash does not count as an update.
+        table = User.__table__  # type: ignore
+        password_statement = (
+            update(table)
+            .where(table.c.id == bindparam('b_id'))
+            .values(hashed_password=bindparam('b_hashed_password'), updated_at=table.c.updated_at)
+        )
+        await self._execute(
+            password_statement,
+            [
+                {'b_id': user.id, 'b_hashed_password': hashed_password}
+                for user, hashed_password in zip(created_users, hashes)
+            ],
+        )
+        await self._commit()
+        await self._invalidate(*(user.id for user in created_users))
+
+        for user, hashed_password in zip(created_users, hashes):
+            user.hashed_password = hashed_password
+
+        return created_users
@@ -0,0 +1,83 @@
+from typing import Any, Awaitable, Callable
+
+import httpx
+import pytest
+from sqlmodel import select
+
+from config.settings import get_settings
+from database.session import async_session_factory
+from user.models.general import User
+
+pytestmark = pytest.mark.anyio
+
+UserFactory = Callable[..., Awaitable[dict[str, Any]]]
+
+
+async def _get_user(id: int) -> User:
+    async with async_session_factory() as session:
+        return (await session.exec(select(User).where(User.id == id))).one()
+
+
+async def test_update_only_writes_the_fields_of_the_request(
+    client: httpx.AsyncClient, create_user: UserFactory, login: UserFactory
+) -> None:
+    await create_user('admin')
+    user = await create_user('jane_doe')
+    headers = {'Authorization': f'Bearer {(await login("admin"))["access_token"]}'}
+
+    response = await client.post(f'/user/{user["id"]}/deactivate', headers=headers)
+    assert response.status_code == 200, response.text
+    deactivated = await _get_user(user['id'])
+
+    body = {'username': 'jane', 'first_name': 'Jane', 'last_name': 'Roe', 'email': 'j@example.com'}
+    response = await client.put(f'/user/{user["id"]}', json=body, headers=headers)
+
+    assert response.status_code == 200, response.text
+    updated = await _get_user(user['id'])
+    assert (updated.username, updated.last_name, updated.email) == ('jane', 'Roe', 'j@example.com')
+    assert updated.is_active is False
+    assert updated.token_version == deactivated.token_version
+    assert updated.hashed_password == deactivated.hashed_password
+
+
+@pytest.mark.parametrize('stateless', [False, True])
+async def test_update_does_not_revive_revoked_tokens(
+    client: httpx.AsyncClient,
+    create_user: UserFactory,
+    login: UserFactory,
+    monkeypatch: pytest.MonkeyPatch,
+    stateless: bool,
+) -> None:
+    monkeypatch.setattr(get_settings().auth_config, 'jwt_stateless', stateless)
+    await create_user('admin')
+    user = await create_user('jane_doe')
+    admin_headers = {'Authorization': f'Bearer {(await login("admin"))["access_token"]}'}
+    headers = {'Authorization': f'Bearer {(await login("jane_doe"))["access_token"]}'}
+    assert (await client.get('/user/me', headers=headers)).status_code == 200
+
+    response = await client.post(f'/user/{user["id"]}/deactivate', headers=admin_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()['data']['is_active'] is False
+    assert (await client.get('/user/me', headers=headers)).status_code == 401
+
+    body = {
+        'username': 'jane_doe',
+        'first_name': 'Jane',
+        'last_name': 'Roe',
+        'email': 'j@example.com',
+    }
+    response = await client.put(f'/user/{user["id"]}', json=body, headers=admin_headers)
+    assert response.status_code == 200, response.text
+
+    assert (await client.get('/user/me', headers=headers)).status_code == 401
+
+
+async def test_deactivate_unknown_user(
+    client: httpx.AsyncClient, create_user: UserFactory, login: UserFactory
+) -> None:
+    await create_user('admin')
+    headers = {'Authorization': f'Bearer {(await login("admin"))["access_token"]}'}
+
+    response = await client.post('/user/999/deactivate', headers=headers)
+
+    assert response.status_code == 404, response.text